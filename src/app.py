@@ -1,20 +1,55 @@
 import cv2
 from pathlib import Path
 
-from fingers.camera import CameraStream
-from fingers.config import CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT, DISPLAY_SCALE, FLIP_HORIZONTAL, FULLSCREEN, MARGIN_PX
+from fingers.camera import CameraStream, open_frame_source
+from fingers.config import (
+    CAMERA_INDEX,
+    FRAME_SOURCE,
+    FRAME_SOURCE_PATH,
+    FRAME_SOURCE_FPS,
+    FRAME_SOURCE_PACED,
+    FRAME_SOURCE_LOOP,
+    MOTION_GATE_ENABLED,
+    DETECTOR_MODE,
+    RECORD_ENABLED,
+    RECORD_RAW,
+    RECORD_METADATA,
+    RECORD_FPS,
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    DISPLAY_SCALE,
+    FLIP_HORIZONTAL,
+    FULLSCREEN,
+    MARGIN_PX,
+)
 from fingers.drawer import draw_hands_and_overlays, _draw_label
-from fingers.hand_detector import HandDetector
 from fingers.finger_counter import FingerCounter
 from fingers.gesture_detector import detect_gestures, GestureImageDisplay
-from fingers.emotion_detector import EmotionDetector
+from fingers.events import EventBus, ChangeEmitter, EVENT_GESTURE
+from fingers.motion_gate import MotionGate
+from fingers.workers import KIND_HANDS, create_detectors
+from fingers.recorder import VideoRecorder, frame_metadata
 
 
 def main() -> None:
-    camera_stream = CameraStream(camera_index=CAMERA_INDEX)
-    detector = HandDetector()
+    source = open_frame_source(
+        kind=FRAME_SOURCE,
+        path=FRAME_SOURCE_PATH or None,
+        camera_index=CAMERA_INDEX,
+        fps=FRAME_SOURCE_FPS or None,
+        paced=FRAME_SOURCE_PACED,
+        loop=FRAME_SOURCE_LOOP,
+    )
+    camera_stream = CameraStream(source=source)
+    detectors = create_detectors(DETECTOR_MODE, emotion_history=7)
     counter = FingerCounter(history_size=5)
-    emotion_detector = EmotionDetector(history_size=7)
+    event_bus = EventBus()
+    change_emitter = ChangeEmitter(event_bus)
+    motion_gate = MotionGate() if MOTION_GATE_ENABLED else None
+    per_hand_counts, total_count = [], 0
+    recorder = None
+    if RECORD_ENABLED:
+        recorder = VideoRecorder(fps=RECORD_FPS or source.fps, record_raw=RECORD_RAW, metadata=RECORD_METADATA)
     
     gesture_display = GestureImageDisplay(base_path=Path("."))
     gesture_display.load_images()
@@ -34,14 +69,28 @@ def main() -> None:
             if FLIP_HORIZONTAL:
                 frame = cv2.flip(frame, 1)
 
-            hand_results = detector.detect_hands(frame)
-            per_hand_counts, total_count = counter.update(hand_results)
+            run_hands, run_face = True, True
+            if motion_gate is not None:
+                run_hands, run_face = motion_gate.check(frame, detectors.hand_results, detectors.face_bbox)
+
+            detectors.submit(frame, run_hands=run_hands, run_face=run_face)
+            updated = detectors.collect()
+            hand_results = detectors.hand_results
+            emotion, face_bbox = detectors.emotion, detectors.face_bbox
+            frame_id = camera_stream.last_frame_id
+            # A histerese conta detecções: sem resultado novo de mãos (motion gate ou worker
+            # ainda ocupado), reaproveita a última contagem
+            if KIND_HANDS in updated:
+                per_hand_counts, total_count = counter.update(hand_results)
+                change_emitter.observe_counts(per_hand_counts, frame_id)
+                if event_bus.has_subscribers(EVENT_GESTURE):
+                    change_emitter.observe_gestures(*detect_gestures(hand_results), frame_id)
             
             # left_gesture, right_gesture = detect_gestures(hand_results)
             # overlay_img = gesture_display.update(left_gesture, right_gesture, frame.shape)
             overlay_img = None
             
-            emotion, face_bbox = emotion_detector.detect_emotion(frame)
+            change_emitter.observe_emotion(emotion, frame_id)
 
             output_frame = draw_hands_and_overlays(
                 frame=frame,
@@ -95,6 +144,14 @@ def main() -> None:
             if overlay_img is not None:
                 output_frame = gesture_display.draw_on_frame(output_frame, overlay_img)
 
+            if recorder is not None:
+                metadata = None
+                if recorder.metadata:
+                    metadata = frame_metadata(
+                        hand_results, per_hand_counts, total_count, emotion, face_bbox, camera_stream.last_timestamp
+                    )
+                recorder.submit(frame_id, output_frame, raw=frame, metadata=metadata, timestamp=camera_stream.last_timestamp)
+
             display_width = int(CAMERA_WIDTH * DISPLAY_SCALE)
             display_height = int(CAMERA_HEIGHT * DISPLAY_SCALE)
             output_frame = cv2.resize(output_frame, (display_width, display_height), interpolation=cv2.INTER_LINEAR)
@@ -108,8 +165,14 @@ def main() -> None:
                 cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, 
                                      cv2.WINDOW_FULLSCREEN if fullscreen else cv2.WINDOW_NORMAL)
     finally:
-        detector.close()
-        emotion_detector.close()
+        event_bus.close()
+        if recorder is not None:
+            recorder.close()
+            print(
+                f"Gravação: {recorder.written} frames gravados, {recorder.dropped} descartados, "
+                f"{recorder.failed} perdidos por erro"
+            )
+        detectors.close()
         camera_stream.release()
         cv2.destroyAllWindows()
 
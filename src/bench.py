@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import cv2
+
+from fingers.camera import CameraStream, open_frame_source
+from fingers.config import CAMERA_INDEX, FLIP_HORIZONTAL
+from fingers.drawer import draw_hands_and_overlays
+from fingers.finger_counter import FingerCounter
+from fingers.motion_gate import MotionGate
+from fingers.workers import KIND_HANDS, create_detectors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mede vazão e latência do pipeline sem janela.")
+    parser.add_argument("--source", default="synthetic", help="camera, video, images, synthetic ou memory")
+    parser.add_argument("--path", default=None)
+    parser.add_argument("--fps", type=float, default=None)
+    parser.add_argument("--paced", action="store_true", help="entrega frames em tempo real na taxa --fps")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--mode", default="inline", help="inline ou process (um processo por detector)")
+    parser.add_argument("--motion-gate", action="store_true", help="pula detectores em frames sem movimento")
+    args = parser.parse_args()
+
+    source = open_frame_source(
+        kind=args.source,
+        path=args.path,
+        camera_index=CAMERA_INDEX,
+        fps=args.fps,
+        paced=args.paced,
+    )
+    camera_stream = CameraStream(source=source)
+    detectors = create_detectors(args.mode, emotion_history=7)
+    counter = FingerCounter(history_size=5)
+    motion_gate = MotionGate() if args.motion_gate else None
+    per_hand_counts, total_count = [], 0
+
+    latencies = []
+    start = time.perf_counter()
+    try:
+        while args.max_frames is None or len(latencies) < args.max_frames:
+            timed = camera_stream.read_timed()
+            if timed is None:
+                break
+            t0 = time.perf_counter()
+            frame = cv2.flip(timed.image, 1) if FLIP_HORIZONTAL else timed.image
+
+            run_hands, run_face = True, True
+            if motion_gate is not None:
+                run_hands, run_face = motion_gate.check(frame, detectors.hand_results, detectors.face_bbox)
+            # Espera os resultados do próprio frame para que os modos sejam comparáveis
+            detectors.submit(frame, run_hands=run_hands, run_face=run_face)
+            updated = detectors.collect(wait=True)
+            hand_results = detectors.hand_results
+            if KIND_HANDS in updated:
+                per_hand_counts, total_count = counter.update(hand_results)
+            draw_hands_and_overlays(
+                frame=frame,
+                hand_results=hand_results,
+                per_hand_counts=per_hand_counts,
+                total_count=total_count,
+            )
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        detectors.close()
+        camera_stream.release()
+
+    elapsed = time.perf_counter() - start
+    if not latencies:
+        print("Nenhum frame processado.")
+        return
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"frames: {len(latencies)}")
+    print(f"vazão: {len(latencies) / elapsed:.1f} fps")
+    if motion_gate is not None:
+        print(f"frames sem detector de mãos: {motion_gate.skipped_hands} | sem rosto: {motion_gate.skipped_face}")
+    print(f"latência p50: {p50 * 1000:.2f} ms | p95: {p95 * 1000:.2f} ms | máx: {latencies[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,120 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
 import cv2
-from typing import Optional
+import numpy as np
 
 from .config import CAMERA_WIDTH, CAMERA_HEIGHT
 
 
-class CameraStream:
-    def __init__(self, camera_index: int = 0) -> None:
+@dataclass
+class TimedFrame:
+    frame_id: int
+    timestamp: float
+    image: np.ndarray
+
+
+class FrameSource(ABC):
+    """
+    Interface base das fontes de frames.
+    Subclasses implementam `_grab`; a base numera os frames, gera os timestamps
+    e, no modo `paced`, espera para entregar os frames na taxa `fps`.
+    """
+
+    def __init__(self, fps: Optional[float] = None, paced: bool = False) -> None:
+        self.fps = fps
+        self.paced = paced and fps is not None and fps > 0
+        self._frame_id = 0
+        self._start: Optional[float] = None
+
+    @abstractmethod
+    def _grab(self) -> Optional[np.ndarray]:
+        """Próximo frame BGR, ou None quando a fonte acabou."""
+
+    def _timestamp(self, frame_id: int, now: float) -> float:
+        """Tempo de mídia determinístico quando há fps; senão, relógio monotônico na chegada do frame."""
+        if self.fps:
+            return frame_id / self.fps
+        return now - self._start
+
+    def read(self) -> Optional[TimedFrame]:
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+
+        if self.paced:
+            due = self._start + self._frame_id / self.fps
+            if due > now:
+                time.sleep(due - now)
+
+        image = self._grab()
+        if image is None:
+            return None
+
+        # _grab pode bloquear (câmera ao vivo), então o relógio é lido depois dele
+        frame = TimedFrame(
+            frame_id=self._frame_id,
+            timestamp=self._timestamp(self._frame_id, time.perf_counter()),
+            image=image,
+        )
+        self._frame_id += 1
+        return frame
+
+    def release(self) -> None:
+        pass
+
+
+class LiveCameraSource(FrameSource):
+    """Câmera ao vivo. A própria câmera dita o ritmo, então `paced` é ignorado."""
+
+    def __init__(self, camera_index: int = 0, width: int = CAMERA_WIDTH, height: int = CAMERA_HEIGHT) -> None:
+        super().__init__(fps=None, paced=False)
         self._cap = cv2.VideoCapture(camera_index)
         if not self._cap.isOpened():
             raise RuntimeError(f"Não foi possível abrir a câmera de índice {camera_index}")
-        
-        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
 
-    def read_frame(self) -> Optional["cv2.Mat"]:
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def _grab(self) -> Optional[np.ndarray]:
+        ok, frame = self._cap.read()
+        if not ok:
+            return None
+        return frame
+
+    def release(self) -> None:
+        try:
+            if self._cap is not None:
+                self._cap.release()
+        except Exception:
+            pass
+
+
+class VideoFileSource(FrameSource):
+    """Arquivo de vídeo. Sem `fps` explícito, usa o fps gravado no arquivo."""
+
+    def __init__(self, path: Union[str, Path], fps: Optional[float] = None, paced: bool = False, loop: bool = False) -> None:
+        self._path = str(path)
+        self._loop = loop
+        self._cap = cv2.VideoCapture(self._path)
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Não foi possível abrir o vídeo {self._path}")
+
+        if fps is None:
+            file_fps = self._cap.get(cv2.CAP_PROP_FPS)
+            fps = file_fps if file_fps and file_fps > 0 else None
+        super().__init__(fps=fps, paced=paced)
+
+    def _grab(self) -> Optional[np.ndarray]:
         ok, frame = self._cap.read()
+        if not ok and self._loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read()
         if not ok:
             return None
         return frame
@@ -25,3 +125,183 @@ class CameraStream:
                 self._cap.release()
         except Exception:
             pass
+
+
+class ImageSequenceSource(FrameSource):
+    """Sequência de imagens: um diretório (ordenado por nome) ou uma lista de caminhos."""
+
+    IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(
+        self,
+        paths: Union[str, Path, Sequence[Union[str, Path]]],
+        fps: Optional[float] = 30.0,
+        paced: bool = False,
+        loop: bool = False,
+    ) -> None:
+        super().__init__(fps=fps, paced=paced)
+        if isinstance(paths, (str, Path)):
+            directory = Path(paths)
+            self._paths = sorted(p for p in directory.iterdir() if p.suffix.lower() in self.IMAGE_SUFFIXES)
+        else:
+            self._paths = [Path(p) for p in paths]
+        if not self._paths:
+            raise RuntimeError(f"Nenhuma imagem encontrada em {paths}")
+        self._loop = loop
+        self._index = 0
+
+    def _grab(self) -> Optional[np.ndarray]:
+        if self._index >= len(self._paths):
+            if not self._loop:
+                return None
+            self._index = 0
+        path = self._paths[self._index]
+        self._index += 1
+        frame = cv2.imread(str(path))
+        if frame is None:
+            raise RuntimeError(f"Não foi possível ler a imagem {path}")
+        return frame
+
+
+def _default_synthetic_frame(frame_id: int, width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """Fundo com ruído e um quadrado que se move, para exercitar o pipeline sem câmera."""
+    frame = rng.integers(0, 40, size=(height, width, 3), dtype=np.uint8)
+    size = max(8, min(width, height) // 5)
+    x = (frame_id * 4) % max(1, width - size)
+    y = (height - size) // 2
+    frame[y:y + size, x:x + size] = (200, 180, 160)
+    return frame
+
+
+class SyntheticSource(FrameSource):
+    """
+    Gera frames deterministicamente a partir de uma seed.
+    `generator(frame_id, width, height, rng)` permite customizar o conteúdo.
+    """
+
+    def __init__(
+        self,
+        width: int = CAMERA_WIDTH,
+        height: int = CAMERA_HEIGHT,
+        num_frames: Optional[int] = 300,
+        fps: Optional[float] = 30.0,
+        paced: bool = False,
+        seed: int = 0,
+        generator: Optional[Callable[[int, int, int, np.random.Generator], np.ndarray]] = None,
+    ) -> None:
+        super().__init__(fps=fps, paced=paced)
+        self._width = width
+        self._height = height
+        self._num_frames = num_frames
+        self._rng = np.random.default_rng(seed)
+        self._generator = generator or _default_synthetic_frame
+
+    def _grab(self) -> Optional[np.ndarray]:
+        if self._num_frames is not None and self._frame_id >= self._num_frames:
+            return None
+        return self._generator(self._frame_id, self._width, self._height, self._rng)
+
+
+class PreloadedSource(FrameSource):
+    """
+    Clipe mantido em memória: elimina I/O e decodificação das medições.
+    Os frames são entregues sem cópia; quem for modificá-los deve copiar antes.
+    """
+
+    def __init__(self, frames: Iterable[np.ndarray], fps: Optional[float] = 30.0, paced: bool = False, loop: bool = False) -> None:
+        super().__init__(fps=fps, paced=paced)
+        self._frames: List[np.ndarray] = list(frames)
+        if not self._frames:
+            raise RuntimeError("Clipe pré-carregado vazio")
+        self._loop = loop
+        self._index = 0
+
+    @classmethod
+    def from_source(
+        cls,
+        source: FrameSource,
+        max_frames: Optional[int] = None,
+        fps: Optional[float] = None,
+        paced: bool = False,
+        loop: bool = False,
+    ) -> "PreloadedSource":
+        """Lê uma outra fonte até o fim (ou `max_frames`) e guarda os frames."""
+        frames: List[np.ndarray] = []
+        try:
+            while max_frames is None or len(frames) < max_frames:
+                timed = source.read()
+                if timed is None:
+                    break
+                frames.append(timed.image)
+        finally:
+            source.release()
+        return cls(frames, fps=fps if fps is not None else (source.fps or 30.0), paced=paced, loop=loop)
+
+    def _grab(self) -> Optional[np.ndarray]:
+        if self._index >= len(self._frames):
+            if not self._loop:
+                return None
+            self._index = 0
+        frame = self._frames[self._index]
+        self._index += 1
+        return frame
+
+
+def open_frame_source(
+    kind: str = "camera",
+    path: Optional[Union[str, Path]] = None,
+    camera_index: int = 0,
+    fps: Optional[float] = None,
+    paced: bool = False,
+    loop: bool = False,
+) -> FrameSource:
+    """
+    Cria uma fonte pelo nome: "camera", "video", "images", "synthetic" ou "memory".
+    "memory" pré-carrega o vídeo/diretório de `path` (ou frames sintéticos sem `path`).
+    """
+    if kind in ("video", "images") and path is None:
+        raise ValueError(f'A fonte "{kind}" precisa de um caminho (path)')
+    if kind == "camera":
+        return LiveCameraSource(camera_index=camera_index)
+    if kind == "video":
+        return VideoFileSource(path, fps=fps, paced=paced, loop=loop)
+    if kind == "images":
+        return ImageSequenceSource(path, fps=fps or 30.0, paced=paced, loop=loop)
+    if kind == "synthetic":
+        return SyntheticSource(fps=fps or 30.0, paced=paced)
+    if kind == "memory":
+        if path is None:
+            inner: FrameSource = SyntheticSource(fps=fps or 30.0)
+        elif Path(path).is_dir():
+            inner = ImageSequenceSource(path, fps=fps or 30.0)
+        else:
+            inner = VideoFileSource(path, fps=fps)
+        return PreloadedSource.from_source(inner, fps=fps, paced=paced, loop=loop)
+    raise ValueError(f"Fonte de frames desconhecida: {kind}")
+
+
+class CameraStream:
+    def __init__(self, camera_index: int = 0, source: Optional[FrameSource] = None) -> None:
+        self._source = source if source is not None else LiveCameraSource(camera_index=camera_index)
+        self.last_frame_id: Optional[int] = None
+        self.last_timestamp: Optional[float] = None
+
+    @property
+    def source(self) -> FrameSource:
+        return self._source
+
+    def read_timed(self) -> Optional[TimedFrame]:
+        timed = self._source.read()
+        if timed is not None:
+            self.last_frame_id = timed.frame_id
+            self.last_timestamp = timed.timestamp
+        return timed
+
+    def read_frame(self) -> Optional["cv2.Mat"]:
+        timed = self.read_timed()
+        if timed is None:
+            return None
+        return timed.image
+
+    def release(self) -> None:
+        self._source.release()
@@ -1,5 +1,12 @@
 CAMERA_INDEX: int = 0
 
+# "camera", "video", "images", "synthetic" ou "memory" (ver camera.open_frame_source)
+FRAME_SOURCE: str = "camera"
+FRAME_SOURCE_PATH: str = ""
+FRAME_SOURCE_FPS: float = 0.0  # 0 = usa o fps do arquivo / padrão da fonte
+FRAME_SOURCE_PACED: bool = True
+FRAME_SOURCE_LOOP: bool = False
+
 CAMERA_WIDTH: int = 400
 CAMERA_HEIGHT: int = 300
 DISPLAY_SCALE: float = 4.0
@@ -11,6 +18,33 @@ MODEL_COMPLEXITY: int = 0
 MIN_DETECTION_CONFIDENCE: float = 0.5
 MIN_TRACKING_CONFIDENCE: float = 0.5
 
+# "inline" roda os detectores no loop principal; "process" usa um processo por detector (ver workers.py)
+DETECTOR_MODE: str = "inline"
+WORKER_RING_SLOTS: int = 4
+WORKER_TIMEOUT_S: float = 5.0  # worker ocupado por mais que isso é reiniciado
+WORKER_STARTUP_TIMEOUT_S: float = 60.0
+WORKER_RESTART_DELAY_S: float = 1.0
+
+# Pula os detectores quando a cena não muda (ver motion_gate.py)
+MOTION_GATE_ENABLED: bool = True
+MOTION_GATE_SIZE = (64, 48)
+MOTION_PIXEL_DELTA: int = 15  # diferença de cinza para um pixel contar como alterado
+MOTION_HAND_THRESHOLD: float = 0.01  # fração de pixels alterados que libera o detector de mãos
+MOTION_FACE_THRESHOLD: float = 0.02
+MOTION_REFRESH_FRAMES: int = 15  # roda de qualquer forma a cada N frames
+
+# Gravação assíncrona do vídeo anotado (ver recorder.py)
+RECORD_ENABLED: bool = False
+RECORD_DIR: str = "gravacoes"
+RECORD_RAW: bool = False  # grava também os frames sem anotação
+RECORD_METADATA: bool = True  # side-car .jsonl com landmarks por frame_id
+RECORD_FPS: float = 0.0  # fps gravado no arquivo; 0 = fps da fonte (câmera ao vivo não informa: usa 30, então ajuste para a taxa real de captura)
+RECORD_FOURCC: str = "mp4v"
+RECORD_QUEUE_SIZE: int = 64
+RECORD_DROP_POLICY: str = "drop"  # "drop" descarta frames com a fila cheia, "block" espera
+RECORD_SEGMENT_SECONDS: float = 300.0  # 0 = sem rotação por tempo
+RECORD_SEGMENT_MB: float = 0.0  # 0 = sem rotação por tamanho
+
 DRAW_LANDMARKS: bool = True
 DRAW_CONNECTIONS: bool = True
 TEXT_COLOR_BGR = (50, 220, 50)
@@ -18,3 +52,6 @@ TEXT_BG_COLOR_BGR = (30, 30, 30)
 TEXT_SCALE: float = 0.8
 TEXT_THICKNESS: int = 2
 MARGIN_PX: int = 10
+
+# Limiares de dedos, gestos e emoções (gerado por tune.py); ausente = valores padrão
+THRESHOLDS_PATH: str = "thresholds.json"
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Iterable, List, Tuple, Union
 import cv2
 import mediapipe as mp
+import numpy as np
 
 from .config import (
     DRAW_CONNECTIONS,
@@ -13,11 +14,12 @@ from .config import (
     TEXT_THICKNESS,
     MARGIN_PX,
 )
-from .hand_types import HandResult
+from .hand_types import HandBatch, HandResult, as_hand_batch
 
 
 _mp_draw = mp.solutions.drawing_utils
 _mp_styles = mp.solutions.drawing_styles
+_connections = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS), dtype=np.intp).reshape(-1, 2)
 
 
 def _draw_label(frame, text: str, org: Tuple[int, int]) -> None:
@@ -29,25 +31,24 @@ def _draw_label(frame, text: str, org: Tuple[int, int]) -> None:
 
 def draw_hands_and_overlays(
     frame,
-    hand_results: List[HandResult],
+    hand_results: Union[HandBatch, Iterable[HandResult]],
     per_hand_counts: List[Tuple[str, int]],
     total_count: int,
 ):
     output = frame.copy()
+    batch = as_hand_batch(hand_results)
+    pixel_landmarks = batch.pixel_landmarks[:batch.count]
 
-    if DRAW_LANDMARKS or DRAW_CONNECTIONS:
-        for hand in hand_results:
-            connections = mp.solutions.hands.HAND_CONNECTIONS
-
+    if batch.count and (DRAW_LANDMARKS or DRAW_CONNECTIONS):
+        for hand_landmarks in pixel_landmarks:
             if DRAW_LANDMARKS:
-                for (x, y) in hand.pixel_landmarks:
-                    cv2.circle(output, (int(x), int(y)), 3, (0, 255, 0), -1, lineType=cv2.LINE_AA)
+                for x, y in hand_landmarks.tolist():
+                    cv2.circle(output, (x, y), 3, (0, 255, 0), -1, lineType=cv2.LINE_AA)
 
             if DRAW_CONNECTIONS:
-                for a_idx, b_idx in connections:
-                    ax, ay = hand.pixel_landmarks[a_idx]
-                    bx, by = hand.pixel_landmarks[b_idx]
-                    cv2.line(output, (int(ax), int(ay)), (int(bx), int(by)), (0, 200, 255), 1, lineType=cv2.LINE_AA)
+                # Um segmento de 2 pontos por conexão, desenhados numa única chamada
+                segments = hand_landmarks[_connections]
+                cv2.polylines(output, segments, False, (0, 200, 255), 1, lineType=cv2.LINE_AA)
 
     _draw_label(output, f"Total: {total_count}", (MARGIN_PX, 30))
 
@@ -1,11 +1,101 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Tuple
 import cv2
 import numpy as np
 import mediapipe as mp
 from collections import deque, Counter
 
+from .thresholds import THRESHOLDS, Thresholds
+
+
+EMOTION_CLASSES = ("feliz", "triste", "brava", "normal")
+
+# Índices do Face Mesh usados por _analyze_emotion_advanced
+MOUTH_LEFT = 61
+MOUTH_RIGHT = 291
+MOUTH_TOP = 13
+MOUTH_BOTTOM = 14
+LEFT_EYEBROW_INNER = 107
+RIGHT_EYEBROW_INNER = 336
+LEFT_EYE_TOP = 159
+RIGHT_EYE_TOP = 386
+LEFT_EYE_BOTTOM = 145
+RIGHT_EYE_BOTTOM = 374
+
+# Rostos menores que isso (px) são sempre "normal"
+MIN_FACE_SIZE = 10
+
+FaceGeometry = Tuple[np.ndarray, np.ndarray]
+
+
+def face_geometry(pixel_landmarks: np.ndarray) -> FaceGeometry:
+    """
+    Medidas de (m, 468, 2) landmarks do rosto, em % do tamanho do rosto.
+    Retorna (m, 5) com curva da boca, aspecto da boca, distância sobrancelha-olho,
+    queda da sobrancelha e abertura dos olhos, e o tamanho do rosto (m,) em px.
+    """
+    face = pixel_landmarks.astype(np.float64)
+    face_size = np.maximum(np.ptp(face[:, :, 0], axis=1), np.ptp(face[:, :, 1], axis=1))
+    safe_size = np.where(face_size > 0, face_size, 1.0)
+
+    mouth_center_y = (face[:, MOUTH_TOP, 1] + face[:, MOUTH_BOTTOM, 1]) / 2.0
+    mouth_corners_y = (face[:, MOUTH_LEFT, 1] + face[:, MOUTH_RIGHT, 1]) / 2.0
+    mouth_curve = (mouth_center_y - mouth_corners_y) / safe_size * 100
+
+    mouth_width = np.abs(face[:, MOUTH_RIGHT, 0] - face[:, MOUTH_LEFT, 0]) / safe_size * 100
+    mouth_height = np.abs(face[:, MOUTH_BOTTOM, 1] - face[:, MOUTH_TOP, 1]) / safe_size * 100
+    mouth_aspect = mouth_height / (mouth_width + 1e-6)
+
+    left_eyebrow_eye_dist = np.abs(face[:, LEFT_EYEBROW_INNER, 1] - face[:, LEFT_EYE_TOP, 1]) / safe_size * 100
+    right_eyebrow_eye_dist = np.abs(face[:, RIGHT_EYEBROW_INNER, 1] - face[:, RIGHT_EYE_TOP, 1]) / safe_size * 100
+    avg_eyebrow_dist = (left_eyebrow_eye_dist + right_eyebrow_eye_dist) / 2.0
+
+    eyebrow_center_y = (face[:, LEFT_EYEBROW_INNER, 1] + face[:, RIGHT_EYEBROW_INNER, 1]) / 2.0
+    eye_center_y = (face[:, LEFT_EYE_TOP, 1] + face[:, RIGHT_EYE_TOP, 1]) / 2.0
+    eyebrow_drop = (eyebrow_center_y - eye_center_y) / safe_size * 100
+
+    left_eye_open = np.abs(face[:, LEFT_EYE_TOP, 1] - face[:, LEFT_EYE_BOTTOM, 1]) / safe_size * 100
+    right_eye_open = np.abs(face[:, RIGHT_EYE_TOP, 1] - face[:, RIGHT_EYE_BOTTOM, 1]) / safe_size * 100
+    avg_eye_open = (left_eye_open + right_eye_open) / 2.0
+
+    measures = np.stack([mouth_curve, mouth_aspect, avg_eyebrow_dist, eyebrow_drop, avg_eye_open], axis=1)
+    return measures, face_size
+
+
+def emotion_rule(geometry: FaceGeometry, th: Thresholds) -> np.ndarray:
+    """
+    Pontua cada emoção a partir de `face_geometry` e retorna índices (m,) em EMOTION_CLASSES.
+    Empates ficam com a primeira classe; pontuação abaixo de `emotion_min_score` é "normal".
+    Com campos de `th` em colunas (P, 1), o resultado vira (P, m).
+    """
+    measures, face_size = geometry
+    curve, aspect, brow, drop, eye = measures.T
+
+    happy = (
+        3.0 * (curve > th.happy_curve_low)
+        + 2.0 * (curve > th.happy_curve_high)
+        + 2.5 * (eye < th.happy_eye_open)
+        + 1.5 * (aspect > th.happy_mouth_aspect)
+        + 2.0 * ((curve > th.happy_combo_curve) & (eye < th.happy_combo_eye_open))
+    )
+    sad = (
+        5.0 * (curve < th.sad_curve_strong)
+        + 3.0 * (curve < th.sad_curve_medium)
+        + 1.5 * (curve < th.sad_curve_weak)
+        + 1.0 * ((eye > th.sad_eye_open) & (curve < th.sad_combo_curve))
+    )
+    angry = np.where(
+        brow < th.angry_brow_strong, 6.0,
+        np.where(brow < th.angry_brow_medium, 4.0, np.where(brow < th.angry_brow_weak, 2.0, 0.0)),
+    ) + 2.0 * (drop < th.angry_brow_drop)
+    normal = np.ones_like(curve)
+
+    scores = np.stack(np.broadcast_arrays(happy, sad, angry, normal), axis=-1)
+    normal_idx = EMOTION_CLASSES.index("normal")
+    pred = np.where(scores.max(axis=-1) < th.emotion_min_score, normal_idx, scores.argmax(axis=-1))
+    return np.where(face_size < MIN_FACE_SIZE, normal_idx, pred)
+
 
 class EmotionDetector:
     def __init__(self, history_size: int = 7):
@@ -85,112 +175,10 @@ class EmotionDetector:
     def _analyze_emotion_advanced(self, landmarks: np.ndarray) -> str:
         """Análise avançada usando múltiplos pontos e relações geométricas"""
         try:
-            MOUTH_LEFT = 61
-            MOUTH_RIGHT = 291
-            MOUTH_TOP = 13
-            MOUTH_BOTTOM = 14
-            MOUTH_CENTER = 13 
-            
-            LEFT_EYEBROW_INNER = 107
-            RIGHT_EYEBROW_INNER = 336
-            LEFT_EYE_TOP = 159
-            RIGHT_EYE_TOP = 386
-            LEFT_EYE_BOTTOM = 145
-            RIGHT_EYE_BOTTOM = 374
-            
-            NOSE_TIP = 1
-            
-            mouth_left = landmarks[MOUTH_LEFT]
-            mouth_right = landmarks[MOUTH_RIGHT]
-            mouth_top = landmarks[MOUTH_TOP]
-            mouth_bottom = landmarks[MOUTH_BOTTOM]
-            
-            left_eyebrow = landmarks[LEFT_EYEBROW_INNER]
-            right_eyebrow = landmarks[RIGHT_EYEBROW_INNER]
-            left_eye_top = landmarks[LEFT_EYE_TOP]
-            right_eye_top = landmarks[RIGHT_EYE_TOP]
-            left_eye_bottom = landmarks[LEFT_EYE_BOTTOM]
-            right_eye_bottom = landmarks[RIGHT_EYE_BOTTOM]
-            nose = landmarks[NOSE_TIP]
-            
-            face_width = abs(landmarks[:, 0].max() - landmarks[:, 0].min())
-            face_height = abs(landmarks[:, 1].max() - landmarks[:, 1].min())
-            face_size = max(face_width, face_height)
-            
-            if face_size < 10:
-                return "normal"
-            
-            mouth_center_y = (mouth_top[1] + mouth_bottom[1]) / 2.0
-            mouth_corners_y = (mouth_left[1] + mouth_right[1]) / 2.0
-            mouth_curve = (mouth_center_y - mouth_corners_y) / face_size * 100
-            
-            mouth_width = abs(mouth_right[0] - mouth_left[0]) / face_size * 100
-            mouth_height = abs(mouth_bottom[1] - mouth_top[1]) / face_size * 100
-            mouth_aspect = mouth_height / (mouth_width + 1e-6)
-            
-            left_eyebrow_eye_dist = abs(left_eyebrow[1] - left_eye_top[1]) / face_size * 100
-            right_eyebrow_eye_dist = abs(right_eyebrow[1] - right_eye_top[1]) / face_size * 100
-            avg_eyebrow_dist = (left_eyebrow_eye_dist + right_eyebrow_eye_dist) / 2.0
-            
-            eyebrow_center_y = (left_eyebrow[1] + right_eyebrow[1]) / 2.0
-            eye_center_y = (left_eye_top[1] + right_eye_top[1]) / 2.0
-            eyebrow_drop = (eyebrow_center_y - eye_center_y) / face_size * 100
-            
-            left_eye_open = abs(left_eye_top[1] - left_eye_bottom[1]) / face_size * 100
-            right_eye_open = abs(right_eye_top[1] - right_eye_bottom[1]) / face_size * 100
-            avg_eye_open = (left_eye_open + right_eye_open) / 2.0
-            
-            scores = {
-                "feliz": 0.0,
-                "triste": 0.0,
-                "brava": 0.0,
-                "normal": 0.0
-            }
-            
-            if mouth_curve > 2.5:
-                scores["feliz"] += 3.0
-            if mouth_curve > 4.0:
-                scores["feliz"] += 2.0
-            if avg_eye_open < 4.5:
-                scores["feliz"] += 2.5
-            if mouth_aspect > 0.18:
-                scores["feliz"] += 1.5
-            if mouth_curve > 3.0 and avg_eye_open < 5.0:
-                scores["feliz"] += 2.0
-            
-            if mouth_curve < -3.5:
-                scores["triste"] += 5.0
-            if mouth_curve < -2.5:
-                scores["triste"] += 3.0
-            if mouth_curve < -1.5:
-                scores["triste"] += 1.5
-            if avg_eye_open > 6.0 and mouth_curve < -2.0:
-                scores["triste"] += 1.0
-            
-            if avg_eyebrow_dist < 4.5:
-                scores["brava"] += 6.0
-            elif avg_eyebrow_dist < 5.5:
-                scores["brava"] += 4.0
-            elif avg_eyebrow_dist < 6.5:
-                scores["brava"] += 2.0
-            
-            if eyebrow_drop < -1.0:
-                scores["brava"] += 2.0
-            
-            scores["normal"] = 1.0
-            
-            max_score = max(scores.values())
-            if max_score < 3.0:
-                return "normal"
-            
-            for emotion, score in scores.items():
-                if score == max_score:
-                    return emotion
-            
-            return "normal"
-            
-        except (IndexError, KeyError) as e:
+            geometry = face_geometry(np.asarray(landmarks)[None])
+        except IndexError:
             return "normal"
+        return EMOTION_CLASSES[int(emotion_rule(geometry, THRESHOLDS)[0])]
     
     def _get_stable_emotion(self) -> Optional[str]:
         """Retorna a emoção mais comum no histórico"""
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+EVENT_COUNT = "count"
+EVENT_GESTURE = "gesture"
+EVENT_EMOTION = "emotion"
+
+
+@dataclass
+class ChangeEvent:
+    kind: str
+    subject: Optional[str]  # "Left"/"Right" para contagem e gesto, None para emoção
+    # Na contagem, None em old/new é a mão fora do frame
+    old: Any
+    new: Any
+    frame_id: Optional[int] = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+Handler = Callable[[ChangeEvent], None]
+
+
+class Subscription:
+    """
+    Fila limitada + thread própria por assinante: um handler lento só atrasa a si mesmo.
+    Quando a fila enche, o evento mais antigo é descartado e contado em `dropped`.
+    """
+
+    _STOP = object()
+
+    def __init__(self, handler: Handler, kinds: Optional[Iterable[str]] = None, maxsize: int = 64) -> None:
+        self.handler = handler
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.dropped = 0
+        self.errors = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="fingers-event-worker", daemon=True)
+        self._thread.start()
+
+    def wants(self, kind: str) -> bool:
+        return self.kinds is None or kind in self.kinds
+
+    def offer(self, event: Any) -> None:
+        """Nunca bloqueia quem publica."""
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is self._STOP:
+                return
+            try:
+                self.handler(event)
+            except Exception as e:
+                self.errors += 1
+                print(f"AVISO: handler de evento falhou: {e}")
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        self.offer(self._STOP)
+        self._thread.join(timeout)
+
+
+class EventBus:
+    def __init__(self, queue_size: int = 64) -> None:
+        self.queue_size = queue_size
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: Handler, kinds: Optional[Iterable[str]] = None, maxsize: Optional[int] = None) -> Subscription:
+        sub = Subscription(handler, kinds=kinds, maxsize=maxsize or self.queue_size)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [sub]
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not sub]
+        sub.stop()
+
+    def has_subscribers(self, kind: Optional[str] = None) -> bool:
+        subs = self._subscriptions
+        if kind is None:
+            return bool(subs)
+        return any(s.wants(kind) for s in subs)
+
+    def publish(self, event: ChangeEvent) -> None:
+        for sub in self._subscriptions:
+            if sub.wants(event.kind):
+                sub.offer(event)
+
+    def close(self) -> None:
+        with self._lock:
+            subs, self._subscriptions = self._subscriptions, []
+        for sub in subs:
+            sub.stop()
+
+
+class ChangeEmitter:
+    """
+    Compara o estado estável do frame com o anterior e publica só as mudanças.
+    Contagem e emoção já chegam estabilizadas (histerese do FingerCounter e
+    histórico do EmotionDetector); gestos passam por uma histerese aqui.
+    Uma mão que sai ou volta ao frame gera um evento de contagem de/para None.
+    """
+
+    def __init__(self, bus: EventBus, gesture_hysteresis_frames: int = 2) -> None:
+        self._bus = bus
+        self.gesture_hysteresis_frames = gesture_hysteresis_frames
+        self._counts: Dict[str, Optional[int]] = {}
+        self._gestures: Dict[str, Optional[str]] = {"Left": None, "Right": None}
+        self._pending_gesture: Dict[str, Optional[str]] = {"Left": None, "Right": None}
+        self._pending_gesture_count: Dict[str, int] = {"Left": 0, "Right": 0}
+        # Mesmo valor inicial do EmotionDetector, para não publicar o padrão antes de ver um rosto
+        self._emotion: Optional[str] = "normal"
+
+    def observe_counts(self, per_hand_counts: Iterable[Tuple[str, int]], frame_id: Optional[int] = None) -> None:
+        """`per_hand_counts` são as mãos presentes no frame, como retorna FingerCounter.update."""
+        present = dict(per_hand_counts)
+        for label in sorted(set(self._counts) | set(present)):
+            old = self._counts.get(label)
+            new = present.get(label)
+            if new != old:
+                self._counts[label] = new
+                self._bus.publish(ChangeEvent(EVENT_COUNT, label, old, new, frame_id))
+
+    def observe_gestures(self, left_gesture: Optional[str], right_gesture: Optional[str], frame_id: Optional[int] = None) -> None:
+        for label, gesture in (("Left", left_gesture), ("Right", right_gesture)):
+            stable = self._gestures[label]
+            if gesture == stable:
+                self._pending_gesture_count[label] = 0
+                continue
+
+            if gesture != self._pending_gesture[label]:
+                self._pending_gesture[label] = gesture
+                self._pending_gesture_count[label] = 0
+            self._pending_gesture_count[label] += 1
+            if self._pending_gesture_count[label] >= self.gesture_hysteresis_frames:
+                self._gestures[label] = gesture
+                self._pending_gesture_count[label] = 0
+                self._bus.publish(ChangeEvent(EVENT_GESTURE, label, stable, gesture, frame_id))
+
+    def observe_emotion(self, emotion: Optional[str], frame_id: Optional[int] = None) -> None:
+        if emotion is None or emotion == self._emotion:
+            return
+        old = self._emotion
+        self._emotion = emotion
+        self._bus.publish(ChangeEvent(EVENT_EMOTION, None, old, emotion, frame_id))
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple, Union
 from collections import deque
 import numpy as np
 
-from .hand_types import HandResult
+from .hand_types import HandBatch, HandResult, as_hand_batch
+from .thresholds import THRESHOLDS, Thresholds
 
 # https://developers.google.com/mediapipe/solutions/vision/hand_landmarker
 THUMB_TIP = 4
@@ -17,59 +18,57 @@ FINGER_TIPS = [8, 12, 16, 20]
 FINGER_PIPS = [6, 10, 14, 18]
 
 
-def _is_right_in_image(pixel_landmarks: np.ndarray) -> bool:
-    return pixel_landmarks[INDEX_MCP][0] < pixel_landmarks[PINKY_MCP][0]
+FINGER_NAMES = ["thumb", "index", "middle", "ring", "pinky"]
 
+FingerGeometry = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
 
-def _is_thumb_up(pixel_landmarks: np.ndarray) -> bool:
-    tip = pixel_landmarks[THUMB_TIP]
-    ip = pixel_landmarks[THUMB_IP]
-    mcp = pixel_landmarks[THUMB_MCP]
-    
-    tip_x = float(tip[0])
-    ip_x = float(ip[0])
-    mcp_x = float(mcp[0])
-    
-    right_in_image = _is_right_in_image(pixel_landmarks)
-    
-    if right_in_image:
-        return tip_x < ip_x 
-    else:
-        return tip_x > ip_x 
 
+def finger_geometry(pixel_landmarks: np.ndarray) -> FingerGeometry:
+    """
+    Medidas de (n, 21, 2) landmarks que as regras dos dedos comparam com os limiares.
+    Retorna polegar levantado (n,), altura da mão (n,) e, para indicador..mínimo,
+    quanto a ponta está acima do PIP e a distância ponta-PIP (n, 4).
+    """
+    lm = pixel_landmarks
+    tip_x = lm[:, THUMB_TIP, 0]
+    ip_x = lm[:, THUMB_IP, 0]
+    right_in_image = lm[:, INDEX_MCP, 0] < lm[:, PINKY_MCP, 0]
+    thumb = np.where(right_in_image, tip_x < ip_x, tip_x > ip_x)
 
-def _hand_bbox_height(pixel_landmarks: np.ndarray) -> float:
-    ys = pixel_landmarks[:, 1]
-    return float(ys.max() - ys.min())
+    ys = lm[:, :, 1]
+    bbox_h = (ys.max(axis=1) - ys.min(axis=1)).astype(np.float64)
+    tips = lm[:, FINGER_TIPS].astype(np.float64)
+    pips = lm[:, FINGER_PIPS].astype(np.float64)
+    gap = pips[..., 1] - tips[..., 1]
+    seg_len = np.linalg.norm(tips - pips, axis=-1)
+    return thumb, bbox_h, gap, seg_len
 
 
-def _is_finger_up(pixel_landmarks: np.ndarray, tip_idx: int, pip_idx: int) -> bool:
-    tip = pixel_landmarks[tip_idx]
-    pip = pixel_landmarks[pip_idx]
-    tip_y = float(tip[1])
-    pip_y = float(pip[1])
-    bbox_h = _hand_bbox_height(pixel_landmarks)
-    min_gap = max(4.0, 0.10 * bbox_h)
-    min_len = max(6.0, 0.15 * bbox_h)
-    seg_len = float(np.linalg.norm(tip - pip))
-    return (pip_y - tip_y) > min_gap and seg_len > min_len
+def fingers_up_rule(geometry: FingerGeometry, th: Thresholds) -> np.ndarray:
+    """
+    Aplica os limiares às medidas de `finger_geometry` e retorna (n, 5) booleanos.
+    Os campos de `th` podem ser colunas (P, 1) em vez de escalares; o resultado
+    vira (P, n, 5), um conjunto de limiares por linha (é assim que o tune.py avalia o grid).
+    """
+    thumb, bbox_h, gap, seg_len = geometry
+    min_gap = np.maximum(th.finger_min_gap_px, th.finger_gap_ratio * bbox_h)[..., None]
+    min_len = np.maximum(th.finger_min_len_px, th.finger_len_ratio * bbox_h)[..., None]
+    fingers = (gap > min_gap) & (seg_len > min_len)
+    thumb = np.broadcast_to(thumb[:, None], fingers.shape[:-1] + (1,))
+    return np.concatenate([thumb, fingers], axis=-1)
 
 
-def count_fingers(hand: HandResult) -> Tuple[int, Dict[str, bool]]:
-    states: Dict[str, bool] = {}
-
-    thumb = _is_thumb_up(hand.pixel_landmarks)
-    states["thumb"] = thumb
+def fingers_up_batch(pixel_landmarks: np.ndarray) -> np.ndarray:
+    """
+    Dedos levantados para (n, 21, 2) landmarks com os limiares atuais.
+    Retorna (n, 5) booleanos: polegar, indicador, médio, anelar e mínimo.
+    """
+    return fingers_up_rule(finger_geometry(pixel_landmarks), THRESHOLDS)
 
-    names = ["index", "middle", "ring", "pinky"]
-    up_count = 1 if thumb else 0
-    for name, tip, pip in zip(names, FINGER_TIPS, FINGER_PIPS):
-        is_up = _is_finger_up(hand.pixel_landmarks, tip, pip)
-        states[name] = is_up
-        if is_up:
-            up_count += 1
 
-    return up_count, states
+def count_fingers(hand: HandResult) -> Tuple[int, Dict[str, bool]]:
+    states = fingers_up_batch(hand.pixel_landmarks[None])[0].tolist()
+    return sum(states), dict(zip(FINGER_NAMES, states))
 
 
 class FingerCounter:
@@ -83,30 +82,34 @@ class FingerCounter:
         self._stable_value: Dict[str, int] = {"Left": 0, "Right": 0}
         self._pending_change_count: Dict[str, int] = {"Left": 0, "Right": 0}
 
-        
-    def update(self, hands: List[HandResult]) -> Tuple[List[Tuple[str, int]], int]:
+    @property
+    def stable_values(self) -> Dict[str, int]:
+        """Cópia da contagem estável (após histerese) de cada mão já vista."""
+        return dict(self._stable_value)
+
+    def update(self, hands: Union[HandBatch, Iterable[HandResult]]) -> Tuple[List[Tuple[str, int]], int]:
         per_hand_counts: List[Tuple[str, int]] = []
         total = 0
 
-        present_labels = [h.handedness_label for h in hands]
-
-        for h in hands:
-            count, _ = count_fingers(h)
+        batch = as_hand_batch(hands)
+        present_labels = batch.labels()
+        counts = fingers_up_batch(batch.pixel_landmarks[:batch.count]).sum(axis=1).tolist()
 
-            dq = self._history.get(h.handedness_label)
+        for label, count in zip(present_labels, counts):
+            dq = self._history.get(label)
             if dq is None:
                 dq = deque(maxlen=self.history_size)
-                self._history[h.handedness_label] = dq
+                self._history[label] = dq
             dq.append(count)
 
-            stable = self._stable_value.get(h.handedness_label, 0)
+            stable = self._stable_value.get(label, 0)
             if count != stable:
-                self._pending_change_count[h.handedness_label] = self._pending_change_count.get(h.handedness_label, 0) + 1
-                if self._pending_change_count[h.handedness_label] >= self.hysteresis_frames:
-                    self._stable_value[h.handedness_label] = count
-                    self._pending_change_count[h.handedness_label] = 0
+                self._pending_change_count[label] = self._pending_change_count.get(label, 0) + 1
+                if self._pending_change_count[label] >= self.hysteresis_frames:
+                    self._stable_value[label] = count
+                    self._pending_change_count[label] = 0
             else:
-                self._pending_change_count[h.handedness_label] = 0
+                self._pending_change_count[label] = 0
 
         for label in present_labels:
             stable = self._stable_value.get(label, 0)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple, Union
 import cv2
 import numpy as np
 from pathlib import Path
 
-from .hand_types import HandResult
-from .finger_counter import count_fingers, _is_finger_up, _is_thumb_up
+from .hand_types import HANDEDNESS_LABELS, HandBatch, HandResult, as_hand_batch
+from .finger_counter import fingers_up_batch
+from .thresholds import THRESHOLDS, Thresholds
 
 
 THUMB_TIP = 4
@@ -23,96 +24,75 @@ PINKY_PIP = 18
 WRIST = 0
 
 
-def _angle_between_vectors(v1: np.ndarray, v2: np.ndarray) -> float:
-    """Calcula o ângulo em graus entre dois vetores"""
-    v1_norm = np.linalg.norm(v1)
-    v2_norm = np.linalg.norm(v2)
-    if v1_norm == 0 or v2_norm == 0:
-        return 0.0
-    cos_angle = np.clip(np.dot(v1, v2) / (v1_norm * v2_norm), -1.0, 1.0)
-    angle_rad = np.arccos(cos_angle)
-    return np.degrees(angle_rad)
+def _angle_between_vectors(v1: np.ndarray, v2: np.ndarray) -> np.ndarray:
+    """Calcula o ângulo em graus entre vetores (no último eixo; aceita lotes)"""
+    v1_norm = np.linalg.norm(v1, axis=-1)
+    v2_norm = np.linalg.norm(v2, axis=-1)
+    valid = (v1_norm != 0) & (v2_norm != 0)
+    cos_angle = np.sum(v1 * v2, axis=-1) / np.where(valid, v1_norm * v2_norm, 1.0)
+    angle_rad = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+    return np.where(valid, np.degrees(angle_rad), 0.0)
 
 
-def _is_L_gesture(hand: HandResult) -> bool:
-    """
-    Detecta gesto L: polegar e indicador levantados formando ~90 graus.
-    L tem ângulo maior (mais perpendicular) que arminha.
-    No L, o polegar está mais horizontal e o indicador mais vertical.
-    """
-    thumb = _is_thumb_up(hand.pixel_landmarks)
-    index = _is_finger_up(hand.pixel_landmarks, INDEX_TIP, INDEX_PIP)
-    middle = _is_finger_up(hand.pixel_landmarks, MIDDLE_TIP, MIDDLE_PIP)
-    ring = _is_finger_up(hand.pixel_landmarks, RING_TIP, RING_PIP)
-    pinky = _is_finger_up(hand.pixel_landmarks, PINKY_TIP, PINKY_PIP)
-    
-    if not (thumb and index and not middle and not ring and not pinky):
-        return False
-    
-    thumb_tip = hand.pixel_landmarks[THUMB_TIP]
-    thumb_mcp = hand.pixel_landmarks[THUMB_MCP]
-    index_tip = hand.pixel_landmarks[INDEX_TIP]
-    index_mcp = hand.pixel_landmarks[INDEX_MCP]
-    
-    thumb_vec = thumb_tip - thumb_mcp
-    index_vec = index_tip - index_mcp
-    
-    angle = _angle_between_vectors(thumb_vec, index_vec)
-    
-    thumb_horizontal = abs(thumb_vec[0]) > abs(thumb_vec[1]) * 0.8
-    index_vertical = abs(index_vec[1]) > abs(index_vec[0]) * 0.8
-    
-    return (75.0 <= angle <= 130.0) and thumb_horizontal and index_vertical
+GestureGeometry = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
 
+def gesture_geometry(pixel_landmarks: np.ndarray) -> GestureGeometry:
+    """Vetores MCP->ponta do polegar e do indicador (n, 2) e o ângulo entre eles (n,)."""
+    lm = pixel_landmarks.astype(np.float64)
+    thumb_vec = lm[:, THUMB_TIP] - lm[:, THUMB_MCP]
+    index_vec = lm[:, INDEX_TIP] - lm[:, INDEX_MCP]
+    return thumb_vec, index_vec, _angle_between_vectors(thumb_vec, index_vec)
 
-def _is_gun_gesture(hand: HandResult) -> bool:
+
+def gesture_rule(states: np.ndarray, geometry: GestureGeometry, th: Thresholds) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Detecta gesto arminha: polegar e indicador levantados mas mais alinhados.
-    Arminha tem ângulo menor que L (mais paralelos).
-    Na arminha, ambos apontam mais na mesma direção (indicador para frente).
+    Máscaras (L, arminha) a partir dos estados de `fingers_up_rule` e de `gesture_geometry`.
+    Os dois exigem polegar e indicador levantados e os demais dedos abaixados.
+    L tem ângulo maior (mais perpendicular), com polegar mais horizontal e
+    indicador mais vertical; na arminha os dois ficam mais alinhados.
+    Com campos de `th` em colunas (P, 1), as máscaras viram (P, n).
     """
-    thumb = _is_thumb_up(hand.pixel_landmarks)
-    index = _is_finger_up(hand.pixel_landmarks, INDEX_TIP, INDEX_PIP)
-    middle = _is_finger_up(hand.pixel_landmarks, MIDDLE_TIP, MIDDLE_PIP)
-    ring = _is_finger_up(hand.pixel_landmarks, RING_TIP, RING_PIP)
-    pinky = _is_finger_up(hand.pixel_landmarks, PINKY_TIP, PINKY_PIP)
-    
-    if not (thumb and index and not middle and not ring and not pinky):
-        return False
-    
-    thumb_tip = hand.pixel_landmarks[THUMB_TIP]
-    thumb_mcp = hand.pixel_landmarks[THUMB_MCP]
-    index_tip = hand.pixel_landmarks[INDEX_TIP]
-    index_mcp = hand.pixel_landmarks[INDEX_MCP]
-    
-    thumb_vec = thumb_tip - thumb_mcp
-    index_vec = index_tip - index_mcp
-    
-    angle = _angle_between_vectors(thumb_vec, index_vec)
-    
-    return 15.0 <= angle < 75.0
+    thumb_vec, index_vec, angle = geometry
+    shape_ok = states[..., 0] & states[..., 1] & ~states[..., 2] & ~states[..., 3] & ~states[..., 4]
+
+    ratio = th.l_axis_ratio
+    thumb_horizontal = np.abs(thumb_vec[:, 0]) > np.abs(thumb_vec[:, 1]) * ratio
+    index_vertical = np.abs(index_vec[:, 1]) > np.abs(index_vec[:, 0]) * ratio
+
+    is_l = (
+        shape_ok
+        & (th.l_angle_min <= angle)
+        & (angle <= th.l_angle_max)
+        & thumb_horizontal
+        & index_vertical
+    )
+    is_gun = shape_ok & (th.gun_angle_min <= angle) & (angle < th.gun_angle_max)
+    return is_l, is_gun
+
 
+def _gesture_masks(pixel_landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Avalia L e arminha para (n, 21, 2) landmarks de uma vez, com os limiares atuais."""
+    return gesture_rule(fingers_up_batch(pixel_landmarks), gesture_geometry(pixel_landmarks), THRESHOLDS)
 
-def detect_gestures(hands: list[HandResult]) -> Tuple[Optional[str], Optional[str]]:
+
+def detect_gestures(hands: Union[HandBatch, Iterable[HandResult]]) -> Tuple[Optional[str], Optional[str]]:
     """
     Detecta gestos nas mãos.
     Returns: (gesto_mao_esquerda, gesto_mao_direita)
     - L apenas na mão esquerda
     - Arminha apenas na mão direita
     """
-    left_gesture = None
-    right_gesture = None
-    
-    for hand in hands:
-        if hand.handedness_label == "Left" and _is_L_gesture(hand):
-            left_gesture = "L"
-            break
-    
-    for hand in hands:
-        if hand.handedness_label == "Right" and _is_gun_gesture(hand):
-            right_gesture = "arminha"
-            break
-    
+    batch = as_hand_batch(hands)
+    n = batch.count
+    if n == 0:
+        return None, None
+
+    is_l, is_gun = _gesture_masks(batch.pixel_landmarks[:n])
+    is_left = batch.handedness[:n] == HANDEDNESS_LABELS.index("Left")
+
+    left_gesture = "L" if np.any(is_l & is_left) else None
+    right_gesture = "arminha" if np.any(is_gun & ~is_left) else None
     return left_gesture, right_gesture
 
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from typing import List
 import cv2
 import mediapipe as mp
 
@@ -10,8 +9,8 @@ from .config import (
     MIN_DETECTION_CONFIDENCE,
     MIN_TRACKING_CONFIDENCE,
 )
-from .hand_types import HandResult
-from .utils import landmarks_to_pixel_xy
+from .hand_types import HANDEDNESS_LABELS, HandBatch
+from .utils import landmarks_to_xyz, normalized_to_pixel_xy
 
 
 class HandDetector:
@@ -25,21 +24,32 @@ class HandDetector:
             min_detection_confidence=MIN_DETECTION_CONFIDENCE,
             min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
         )
+        self._batch = HandBatch(MAX_NUM_HANDS)
 
-    def detect_hands(self, bgr_frame: "cv2.Mat") -> List[HandResult]:
+    def detect_hands(self, bgr_frame: "cv2.Mat") -> HandBatch:
+        """O batch retornado é reaproveitado: vale até a próxima chamada."""
         rgb = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
         result = self._hands.process(rgb)
-        hands: List[HandResult] = []
+        batch = self._batch
+        batch.clear()
 
         if result.multi_hand_landmarks and result.multi_handedness:
             for hand_landmarks, handedness in zip(
                 result.multi_hand_landmarks, result.multi_handedness
             ):
-                label = handedness.classification[0].label  # "Left" ou "Right"
-                pixel_lms = landmarks_to_pixel_xy(hand_landmarks.landmark, bgr_frame.shape)
-                hands.append(HandResult(handedness_label=label, pixel_landmarks=pixel_lms))
-
-        return hands
+                i = batch.count
+                if i >= batch.capacity:
+                    break
+                classification = handedness.classification[0]
+                batch.handedness[i] = HANDEDNESS_LABELS.index(classification.label)  # "Left" ou "Right"
+                batch.scores[i] = classification.score
+                landmarks_to_xyz(hand_landmarks.landmark, batch.landmarks[i])
+                batch.count = i + 1
+
+            n = batch.count
+            normalized_to_pixel_xy(batch.landmarks[:n], bgr_frame.shape, batch.pixel_landmarks[:n])
+
+        return batch
 
     def close(self) -> None:
         try:
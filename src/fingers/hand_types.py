@@ -1,7 +1,13 @@
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 import numpy as np
 
+from .config import MAX_NUM_HANDS
+
+
+HANDEDNESS_LABELS: Tuple[str, ...] = ("Left", "Right")
+NUM_LANDMARKS: int = 21
+
 
 @dataclass
 class HandResult:
@@ -9,8 +15,87 @@ class HandResult:
     pixel_landmarks: np.ndarray
 
 
-@dataclass
-class FrameCounts:
-    per_hand_counts: List[Tuple[str, int]]
-    total_count: int
+class HandBatch:
+    """
+    Mãos de um frame em arrays pré-alocados, reaproveitados a cada frame.
+    Só as primeiras `count` linhas são válidas. Iterar devolve HandResults que
+    apontam para as linhas do batch, então valem até o próximo preenchimento.
+    """
+
+    __slots__ = ("landmarks", "pixel_landmarks", "handedness", "scores", "count")
+
+    def __init__(self, max_hands: int = MAX_NUM_HANDS) -> None:
+        self.landmarks = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)  # x, y, z normalizados
+        self.pixel_landmarks = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.int32)
+        self.handedness = np.zeros(max_hands, dtype=np.int8)  # índice em HANDEDNESS_LABELS
+        self.scores = np.zeros(max_hands, dtype=np.float32)
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.handedness)
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def append(
+        self,
+        handedness_label: str,
+        pixel_landmarks: np.ndarray,
+        landmarks: Optional[np.ndarray] = None,
+        score: float = 1.0,
+    ) -> bool:
+        """Adiciona uma mão; retorna False se o batch já está cheio."""
+        i = self.count
+        if i >= self.capacity:
+            return False
+        self.handedness[i] = HANDEDNESS_LABELS.index(handedness_label)
+        self.pixel_landmarks[i] = pixel_landmarks
+        if landmarks is not None:
+            self.landmarks[i] = landmarks
+        else:
+            self.landmarks[i] = 0.0
+        self.scores[i] = score
+        self.count = i + 1
+        return True
+
+    def load(self, pixel_landmarks: np.ndarray, handedness: np.ndarray, scores: np.ndarray, landmarks: np.ndarray, count: int) -> None:
+        """Copia arrays no mesmo layout (ex.: vindos de outro processo)."""
+        n = min(count, self.capacity)
+        self.pixel_landmarks[:n] = pixel_landmarks[:n]
+        self.handedness[:n] = handedness[:n]
+        self.scores[:n] = scores[:n]
+        self.landmarks[:n] = landmarks[:n]
+        self.count = n
+
+    @classmethod
+    def from_results(cls, hands: Iterable[HandResult], max_hands: int = MAX_NUM_HANDS) -> "HandBatch":
+        hands = list(hands)
+        batch = cls(max(max_hands, len(hands)))
+        for h in hands:
+            batch.append(h.handedness_label, h.pixel_landmarks)
+        return batch
+
+    def labels(self) -> List[str]:
+        return [HANDEDNESS_LABELS[code] for code in self.handedness[:self.count].tolist()]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> HandResult:
+        if not -self.count <= i < self.count:
+            raise IndexError(i)
+        i %= self.count
+        return HandResult(handedness_label=HANDEDNESS_LABELS[self.handedness[i]], pixel_landmarks=self.pixel_landmarks[i])
+
+    def __iter__(self) -> Iterator[HandResult]:
+        for i in range(self.count):
+            yield self[i]
+
+
+def as_hand_batch(hands: Union[HandBatch, Iterable[HandResult]]) -> HandBatch:
+    """Aceita o formato antigo (lista de HandResult) onde se espera um HandBatch."""
+    if isinstance(hands, HandBatch):
+        return hands
+    return HandBatch.from_results(hands)
 
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .config import (
+    MOTION_GATE_SIZE,
+    MOTION_PIXEL_DELTA,
+    MOTION_HAND_THRESHOLD,
+    MOTION_FACE_THRESHOLD,
+    MOTION_REFRESH_FRAMES,
+)
+from .hand_types import HandBatch, HandResult, as_hand_batch
+
+
+BBox = Tuple[int, int, int, int]
+
+
+class MotionGate:
+    """
+    Decide, por frame, se vale rodar o detector de mãos e o de rosto.
+    Compara uma miniatura em cinza com a miniatura do último frame em que cada
+    detector rodou: mudanças lentas se acumulam até disparar. Mede a fração de
+    pixels alterados no frame inteiro e na região do último resultado (mão ou rosto),
+    para que pequenos movimentos de dedos também contem.
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = MOTION_GATE_SIZE,
+        pixel_delta: int = MOTION_PIXEL_DELTA,
+        hand_threshold: float = MOTION_HAND_THRESHOLD,
+        face_threshold: float = MOTION_FACE_THRESHOLD,
+        refresh_frames: int = MOTION_REFRESH_FRAMES,
+    ) -> None:
+        self.size = size
+        self.pixel_delta = pixel_delta
+        self.hand_threshold = hand_threshold
+        self.face_threshold = face_threshold
+        self.refresh_frames = refresh_frames
+        self._hand_ref: Optional[np.ndarray] = None
+        self._face_ref: Optional[np.ndarray] = None
+        self._hand_age = 0
+        self._face_age = 0
+        self.skipped_hands = 0
+        self.skipped_face = 0
+
+    def _thumbnail(self, bgr_frame) -> np.ndarray:
+        small = cv2.resize(bgr_frame, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def _to_thumb_region(self, bbox: BBox, frame_shape) -> Tuple[slice, slice]:
+        """Converte um bbox em pixels para a miniatura, com 50% de margem."""
+        height, width = frame_shape[:2]
+        sx = self.size[0] / width
+        sy = self.size[1] / height
+        x, y, w, h = bbox
+        mx, my = w // 2, h // 2
+        x0 = max(0, int((x - mx) * sx))
+        y0 = max(0, int((y - my) * sy))
+        x1 = min(self.size[0], int((x + w + mx) * sx) + 1)
+        y1 = min(self.size[1], int((y + h + my) * sy) + 1)
+        return slice(y0, y1), slice(x0, x1)
+
+    def _changed(self, thumb: np.ndarray, ref: Optional[np.ndarray], bbox: Optional[BBox], frame_shape, threshold: float) -> bool:
+        if ref is None:
+            return True
+        mask = cv2.absdiff(thumb, ref) > self.pixel_delta
+        if mask.mean() >= threshold:
+            return True
+        if bbox is not None:
+            region = mask[self._to_thumb_region(bbox, frame_shape)]
+            return region.size > 0 and region.mean() >= threshold
+        return False
+
+    @staticmethod
+    def hands_bbox(hand_results: Union[HandBatch, Iterable[HandResult]]) -> Optional[BBox]:
+        batch = as_hand_batch(hand_results)
+        if batch.count == 0:
+            return None
+        points = batch.pixel_landmarks[:batch.count].reshape(-1, 2)
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0)
+        return int(x0), int(y0), int(x1 - x0), int(y1 - y0)
+
+    def check(
+        self,
+        bgr_frame,
+        hand_results: Union[HandBatch, Iterable[HandResult]],
+        face_bbox: Optional[BBox],
+    ) -> Tuple[bool, bool]:
+        """
+        Retorna (rodar_mãos, rodar_rosto) para este frame. Quando um detector é
+        liberado, o frame atual vira a nova referência dele; por isso o chamador
+        deve de fato rodá-lo.
+        """
+        thumb = self._thumbnail(bgr_frame)
+
+        self._hand_age += 1
+        run_hands = self._hand_age >= self.refresh_frames or self._changed(
+            thumb, self._hand_ref, self.hands_bbox(hand_results), bgr_frame.shape, self.hand_threshold
+        )
+        if run_hands:
+            self._hand_ref = thumb
+            self._hand_age = 0
+        else:
+            self.skipped_hands += 1
+
+        self._face_age += 1
+        run_face = self._face_age >= self.refresh_frames or self._changed(
+            thumb, self._face_ref, face_bbox, bgr_frame.shape, self.face_threshold
+        )
+        if run_face:
+            self._face_ref = thumb
+            self._face_age = 0
+        else:
+            self.skipped_face += 1
+
+        return run_hands, run_face
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .config import (
+    RECORD_DIR,
+    RECORD_FPS,
+    RECORD_FOURCC,
+    RECORD_QUEUE_SIZE,
+    RECORD_DROP_POLICY,
+    RECORD_SEGMENT_SECONDS,
+    RECORD_SEGMENT_MB,
+)
+from .hand_types import HandBatch, HandResult, as_hand_batch
+
+
+POLICY_DROP = "drop"
+POLICY_BLOCK = "block"
+
+# Tamanho do arquivo só é consultado a cada N frames
+_SIZE_CHECK_INTERVAL = 30
+# fps do arquivo quando nem a configuração nem a fonte informam (câmera ao vivo)
+_DEFAULT_FPS = 30.0
+
+
+def frame_metadata(
+    hand_results: Union[HandBatch, Iterable[HandResult]],
+    per_hand_counts: List[Tuple[str, int]],
+    total_count: int,
+    emotion: Optional[str] = None,
+    face_bbox: Optional[Tuple[int, int, int, int]] = None,
+    timestamp: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Registro do side-car de um frame, já em tipos serializáveis em JSON."""
+    batch = as_hand_batch(hand_results)
+    landmarks = batch.pixel_landmarks[:batch.count].tolist()
+    return {
+        "timestamp": timestamp,
+        "hands": [
+            {"label": label, "landmarks": lms}
+            for label, lms in zip(batch.labels(), landmarks)
+        ],
+        "counts": {label: count for label, count in per_hand_counts},
+        "total": total_count,
+        "emotion": emotion,
+        "face_bbox": list(face_bbox) if face_bbox else None,
+    }
+
+
+class _Segment:
+    def __init__(self, base: Path, index: int, fourcc: str, fps: float, record_raw: bool, metadata: bool) -> None:
+        self.index = index
+        self.fourcc = fourcc
+        self.fps = fps
+        self.path = base.with_name(f"{base.name}_{index:04d}.mp4")
+        self.raw_path = base.with_name(f"{base.name}_{index:04d}_raw.mp4") if record_raw else None
+        self.meta_path = base.with_name(f"{base.name}_{index:04d}.jsonl") if metadata else None
+        self.frames = 0
+        self.start_timestamp: Optional[float] = None
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._raw_writer: Optional[cv2.VideoWriter] = None
+        self._meta_file = open(self.meta_path, "w", encoding="utf-8") if self.meta_path else None
+
+    def _open_writer(self, path: Path, frame: np.ndarray) -> cv2.VideoWriter:
+        height, width = frame.shape[:2]
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"Não foi possível abrir o arquivo de gravação {path}")
+        return writer
+
+    def write(
+        self,
+        frame_id: int,
+        timestamp: float,
+        annotated: Optional[np.ndarray],
+        raw: Optional[np.ndarray],
+        metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        if self.start_timestamp is None:
+            self.start_timestamp = timestamp
+        if annotated is not None:
+            if self._writer is None:
+                self._writer = self._open_writer(self.path, annotated)
+            self._writer.write(annotated)
+        if raw is not None and self.raw_path is not None:
+            if self._raw_writer is None:
+                self._raw_writer = self._open_writer(self.raw_path, raw)
+            self._raw_writer.write(raw)
+        if self._meta_file is not None:
+            record = {"frame_id": frame_id, "segment_frame": self.frames}
+            if metadata:
+                record.update(metadata)
+            self._meta_file.write(json.dumps(record) + "\n")
+        self.frames += 1
+
+    def size_bytes(self) -> int:
+        total = 0
+        for path in (self.path, self.raw_path):
+            if path is not None and path.exists():
+                total += os.path.getsize(path)
+        return total
+
+    def close(self) -> None:
+        for writer in (self._writer, self._raw_writer):
+            try:
+                if writer is not None:
+                    writer.release()
+            except Exception:
+                pass
+        if self._meta_file is not None:
+            self._meta_file.close()
+
+
+class VideoRecorder:
+    """
+    Grava o vídeo anotado (e opcionalmente o cru) numa thread própria.
+    O loop só entrega os frames numa fila limitada; com a política "drop" um
+    frame que não cabe é descartado e contado em `dropped`, com "block" o loop
+    espera a fila. Depois de um erro de gravação, os frames seguintes são
+    contados em `failed`; ao fechar, submitted == written + dropped + failed.
+    Segmentos giram por duração, medida nos timestamps dos
+    frames entregues (frames descartados não encurtam nem alongam o segmento),
+    ou por tamanho, cada um com um side-car .jsonl opcional alinhado por frame_id.
+    `fps` só define a taxa gravada no arquivo e deve ser a taxa real da fonte.
+    Os frames entregues não devem ser modificados depois de `submit`.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = RECORD_DIR,
+        prefix: Optional[str] = None,
+        fps: Optional[float] = RECORD_FPS,
+        fourcc: str = RECORD_FOURCC,
+        queue_size: int = RECORD_QUEUE_SIZE,
+        policy: str = RECORD_DROP_POLICY,
+        segment_seconds: float = RECORD_SEGMENT_SECONDS,
+        segment_mb: float = RECORD_SEGMENT_MB,
+        record_raw: bool = False,
+        metadata: bool = True,
+    ) -> None:
+        if policy not in (POLICY_DROP, POLICY_BLOCK):
+            raise ValueError(f"Política de gravação desconhecida: {policy}")
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._base = self.output_dir / (prefix or time.strftime("gravacao_%Y%m%d_%H%M%S"))
+        self.fps = fps or _DEFAULT_FPS
+        self.fourcc = fourcc
+        self.policy = policy
+        self.segment_seconds = segment_seconds if segment_seconds > 0 else 0.0
+        self.segment_bytes = int(segment_mb * 1024 * 1024) if segment_mb > 0 else 0
+        self.record_raw = record_raw
+        self.metadata = metadata
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.segments: List[Path] = []
+        self.error: Optional[Exception] = None
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._segment: Optional[_Segment] = None
+        self._failed_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="fingers-recorder", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        frame_id: int,
+        annotated: Optional[np.ndarray],
+        raw: Optional[np.ndarray] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """
+        Entrega o frame para a thread de gravação. Retorna False se foi descartado.
+        `timestamp` (em segundos, ex.: CameraStream.last_timestamp) marca a rotação
+        por duração; sem ele, vale o relógio monotônico no momento da entrega.
+        """
+        self.submitted += 1
+        if self.error is not None:
+            self._count_failed()
+            return False
+        if timestamp is None:
+            timestamp = time.monotonic()
+        item = (frame_id, timestamp, annotated, raw if self.record_raw else None, metadata if self.metadata else None)
+        if self.policy == POLICY_BLOCK:
+            self._queue.put(item)
+            return True
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _count_failed(self) -> None:
+        # Incrementado pelo loop (submit) e pela thread de gravação
+        with self._failed_lock:
+            self.failed += 1
+
+    def _should_rotate(self, segment: _Segment, timestamp: float) -> bool:
+        if self.segment_seconds and segment.start_timestamp is not None:
+            if timestamp - segment.start_timestamp >= self.segment_seconds:
+                return True
+        if self.segment_bytes and segment.frames % _SIZE_CHECK_INTERVAL == 0 and segment.frames > 0:
+            return segment.size_bytes() >= self.segment_bytes
+        return False
+
+    def _next_segment(self) -> _Segment:
+        index = len(self.segments)
+        segment = _Segment(self._base, index, self.fourcc, self.fps, self.record_raw, self.metadata)
+        self.segments.append(segment.path)
+        return segment
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            if self.error is not None:
+                self._count_failed()
+                continue
+            try:
+                if self._segment is None:
+                    self._segment = self._next_segment()
+                elif self._should_rotate(self._segment, item[1]):
+                    self._segment.close()
+                    self._segment = self._next_segment()
+                self._segment.write(*item)
+                self.written += 1
+            except Exception as e:
+                self.error = e
+                self._count_failed()
+                print(f"AVISO: gravação interrompida: {e}")
+
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Grava o que ainda está na fila e fecha os arquivos."""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
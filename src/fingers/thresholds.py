@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Union
+
+from .config import THRESHOLDS_PATH
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    # fingers_up_rule: gap/comprimento mínimos entre ponta e PIP (px e fração da altura da mão)
+    finger_min_gap_px: float = 4.0
+    finger_gap_ratio: float = 0.10
+    finger_min_len_px: float = 6.0
+    finger_len_ratio: float = 0.15
+
+    # gesture_rule (L e arminha): janelas de ângulo polegar x indicador (graus)
+    l_angle_min: float = 75.0
+    l_angle_max: float = 130.0
+    l_axis_ratio: float = 0.8
+    gun_angle_min: float = 15.0
+    gun_angle_max: float = 75.0
+
+    # emotion_rule: medidas em % do tamanho do rosto
+    happy_curve_low: float = 2.5
+    happy_curve_high: float = 4.0
+    happy_eye_open: float = 4.5
+    happy_mouth_aspect: float = 0.18
+    happy_combo_curve: float = 3.0
+    happy_combo_eye_open: float = 5.0
+    sad_curve_strong: float = -3.5
+    sad_curve_medium: float = -2.5
+    sad_curve_weak: float = -1.5
+    sad_eye_open: float = 6.0
+    sad_combo_curve: float = -2.0
+    angry_brow_strong: float = 4.5
+    angry_brow_medium: float = 5.5
+    angry_brow_weak: float = 6.5
+    angry_brow_drop: float = -1.0
+    emotion_min_score: float = 3.0
+
+
+FINGER_FIELDS = ("finger_min_gap_px", "finger_gap_ratio", "finger_min_len_px", "finger_len_ratio")
+GESTURE_FIELDS = ("l_angle_min", "l_angle_max", "l_axis_ratio", "gun_angle_min", "gun_angle_max")
+EMOTION_FIELDS = tuple(f.name for f in fields(Thresholds) if f.name not in FINGER_FIELDS + GESTURE_FIELDS)
+
+
+def load_thresholds(path: Union[str, Path] = THRESHOLDS_PATH) -> Thresholds:
+    """Lê os limiares de um JSON (ex.: gerado pelo tune.py). Chaves ausentes mantêm o padrão."""
+    path = Path(path)
+    if not path.exists():
+        return Thresholds()
+
+    data: Dict[str, float] = json.loads(path.read_text(encoding="utf-8"))
+    known = {f.name for f in fields(Thresholds)}
+    unknown = set(data) - known
+    if unknown:
+        print(f"AVISO: limiares desconhecidos ignorados em {path}: {', '.join(sorted(unknown))}")
+    return replace(Thresholds(), **{k: float(v) for k, v in data.items() if k in known})
+
+
+def save_thresholds(thresholds: Thresholds, path: Union[str, Path] = THRESHOLDS_PATH) -> None:
+    Path(path).write_text(json.dumps(asdict(thresholds), indent=2) + "\n", encoding="utf-8")
+
+
+THRESHOLDS: Thresholds = load_thresholds()
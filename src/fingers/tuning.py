@@ -0,0 +1,273 @@
+"""
+Avaliação vetorizada dos limiares de dedos, gestos e emoções.
+
+Datasets rotulados são arquivos .npz com mãos, rostos ou os dois:
+  - hand_landmarks (N, 21, 2): landmarks da mão em pixels, como em HandResult.pixel_landmarks
+  - handedness     (N,):       "Left" / "Right" (obrigatório com hand_landmarks)
+  - finger_counts  (N,):       dedos levantados (0..5), opcional
+  - gestures       (N,):       "" / "L" / "arminha", opcional
+  - face_landmarks (M, 468, 2): landmarks do rosto em pixels
+  - emotions       (M,):       "feliz" / "triste" / "brava" / "normal" (obrigatório com face_landmarks)
+
+As regras são as mesmas do caminho ao vivo (`fingers_up_rule`, `gesture_rule`,
+`emotion_rule`), avaliadas com os limiares em colunas (P, 1) para frames x conjuntos
+de parâmetros de uma vez; as medidas que não dependem dos limiares saem uma vez por dataset.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .emotion_detector import EMOTION_CLASSES, FaceGeometry, emotion_rule, face_geometry
+from .finger_counter import FingerGeometry, finger_geometry, fingers_up_rule
+from .gesture_detector import GestureGeometry, gesture_geometry, gesture_rule
+from .thresholds import Thresholds, FINGER_FIELDS, GESTURE_FIELDS, EMOTION_FIELDS
+
+
+GESTURE_CLASSES = ("", "L", "arminha")
+COUNT_CLASSES = tuple(range(6))
+TASKS = ("finger", "gesture", "emotion")
+
+_CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass
+class LabeledData:
+    hand_landmarks: np.ndarray
+    handedness: np.ndarray
+    finger_counts: np.ndarray
+    gestures: np.ndarray
+    face_landmarks: np.ndarray
+    emotions: np.ndarray
+
+
+def _require(data, path: Path, key: str, n: int) -> np.ndarray:
+    """Array que acompanha os landmarks; erro claro se faltar ou tiver outro tamanho."""
+    if key not in data:
+        raise ValueError(f"{path}: falta o array '{key}'")
+    values = data[key]
+    if len(values) != n:
+        raise ValueError(f"{path}: '{key}' tem {len(values)} itens, esperado {n}")
+    return values
+
+
+def load_datasets(paths: Sequence[Union[str, Path]]) -> LabeledData:
+    """Concatena os .npz (arquivos ou diretórios com .npz)."""
+    files: List[Path] = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.glob("*.npz")) if p.is_dir() else [p])
+    if not files:
+        raise RuntimeError("Nenhum dataset .npz encontrado")
+
+    parts: Dict[str, List[np.ndarray]] = {k: [] for k in LabeledData.__dataclass_fields__}
+    for f in files:
+        with np.load(f, allow_pickle=False) as data:
+            if "hand_landmarks" in data:
+                n = len(data["hand_landmarks"])
+                parts["hand_landmarks"].append(data["hand_landmarks"].astype(np.float64))
+                parts["handedness"].append(_require(data, f, "handedness", n).astype(str))
+                parts["finger_counts"].append(_require(data, f, "finger_counts", n).astype(np.int64) if "finger_counts" in data else np.full(n, -1))
+                parts["gestures"].append(_require(data, f, "gestures", n).astype(str) if "gestures" in data else np.full(n, "?"))
+            if "face_landmarks" in data:
+                m = len(data["face_landmarks"])
+                parts["face_landmarks"].append(data["face_landmarks"].astype(np.float64))
+                parts["emotions"].append(_require(data, f, "emotions", m).astype(str))
+
+    empty = {
+        "hand_landmarks": np.zeros((0, 21, 2)),
+        "handedness": np.array([], dtype=str),
+        "finger_counts": np.zeros(0, dtype=np.int64),
+        "gestures": np.array([], dtype=str),
+        "face_landmarks": np.zeros((0, 468, 2)),
+        "emotions": np.array([], dtype=str),
+    }
+    merged = {key: np.concatenate(arrays) if arrays else empty[key] for key, arrays in parts.items()}
+    return LabeledData(**merged)
+
+
+@dataclass
+class _Features:
+    """Tudo que não depende dos parâmetros, calculado uma vez por dataset."""
+    fingers: FingerGeometry
+    gesture: GestureGeometry
+    face: FaceGeometry
+    is_left: np.ndarray         # (N,)
+    count_labels: np.ndarray    # (N,)
+    gesture_labels: np.ndarray  # (N,) índice em GESTURE_CLASSES, -1 sem rótulo
+    emotion_labels: np.ndarray  # (M,)
+
+
+def _class_index(labels: np.ndarray, classes: Sequence) -> np.ndarray:
+    out = np.full(len(labels), -1, dtype=np.int64)
+    for i, c in enumerate(classes):
+        out[labels == c] = i
+    return out
+
+
+def extract_features(data: LabeledData) -> _Features:
+    return _Features(
+        fingers=finger_geometry(data.hand_landmarks),
+        gesture=gesture_geometry(data.hand_landmarks),
+        face=face_geometry(data.face_landmarks),
+        is_left=data.handedness == "Left",
+        count_labels=np.asarray(data.finger_counts, dtype=np.int64),
+        gesture_labels=_class_index(data.gestures, GESTURE_CLASSES),
+        emotion_labels=_class_index(data.emotions, EMOTION_CLASSES),
+    )
+
+
+def _grid_thresholds(params: np.ndarray, names: Sequence[str]) -> Thresholds:
+    """Thresholds com cada campo numa coluna (P, 1), para as regras avaliarem P conjuntos de uma vez."""
+    return Thresholds(**{name: params[:, i][:, None] for i, name in enumerate(names)})
+
+
+def predict_fingers(f: _Features, params: np.ndarray, names: Sequence[str]) -> np.ndarray:
+    """Estados (P, N, 5) de polegar, indicador, médio, anelar e mínimo."""
+    return fingers_up_rule(f.fingers, _grid_thresholds(params, names))
+
+
+def predict_gestures(f: _Features, states: np.ndarray, params: np.ndarray, names: Sequence[str]) -> np.ndarray:
+    """Índices (P, N) em GESTURE_CLASSES, como `detect_gestures` faria para cada mão."""
+    is_l, is_gun = gesture_rule(states, f.gesture, _grid_thresholds(params, names))
+    return np.where(f.is_left & is_l, 1, np.where(~f.is_left & is_gun, 2, 0))
+
+
+def predict_emotions(f: _Features, params: np.ndarray, names: Sequence[str]) -> np.ndarray:
+    """Índices (P, M) em EMOTION_CLASSES."""
+    return emotion_rule(f.face, _grid_thresholds(params, names))
+
+
+def _accuracy_f1(pred: np.ndarray, labels: np.ndarray, n_classes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Acurácia e F1 macro (classes presentes nos rótulos) por conjunto de parâmetros."""
+    mask = labels >= 0
+    pred, labels = pred[:, mask], labels[mask]
+    if labels.size == 0:
+        nan = np.full(pred.shape[0], np.nan)
+        return nan, nan
+
+    accuracy = (pred == labels).mean(axis=1)
+    f1s = []
+    for c in range(n_classes):
+        is_c = labels == c
+        if not is_c.any():
+            continue
+        pred_c = pred == c
+        tp = (pred_c & is_c).sum(axis=1)
+        fp = (pred_c & ~is_c).sum(axis=1)
+        fn = (~pred_c & is_c).sum(axis=1)
+        f1s.append(2 * tp / np.maximum(2 * tp + fp + fn, 1))
+    return accuracy, np.mean(f1s, axis=0)
+
+
+def evaluate(f: _Features, params: np.ndarray, names: Sequence[str], task: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Métricas (P,) para cada linha de `params`; tarefas sem rótulo dão NaN.
+    Com `task`, só calcula as métricas dessa tarefa ("{task}_accuracy" e "{task}_f1").
+    """
+    if task is not None and task not in TASKS:
+        raise ValueError(f"Tarefa desconhecida: {task}")
+    metrics: Dict[str, np.ndarray] = {}
+    if task in (None, "finger", "gesture"):
+        states = predict_fingers(f, params, names)
+        if task != "gesture":
+            counts = states.sum(axis=-1)
+            metrics["finger_accuracy"], metrics["finger_f1"] = _accuracy_f1(counts, f.count_labels, len(COUNT_CLASSES))
+        if task != "finger":
+            gestures = predict_gestures(f, states, params, names)
+            metrics["gesture_accuracy"], metrics["gesture_f1"] = _accuracy_f1(gestures, f.gesture_labels, len(GESTURE_CLASSES))
+    if task in (None, "emotion"):
+        emotions = predict_emotions(f, params, names)
+        metrics["emotion_accuracy"], metrics["emotion_f1"] = _accuracy_f1(emotions, f.emotion_labels, len(EMOTION_CLASSES))
+    return metrics
+
+
+def build_grid(base: Thresholds, grid: Dict[str, Sequence[float]]) -> Tuple[np.ndarray, List[str]]:
+    """Produto cartesiano do grid; campos fora dele ficam com o valor de `base`."""
+    names = list(asdict(base))
+    unknown = set(grid) - set(names)
+    if unknown:
+        raise ValueError(f"Limiares desconhecidos no grid: {', '.join(sorted(unknown))}")
+
+    columns = [np.asarray(grid.get(n, [getattr(base, n)]), dtype=np.float64) for n in names]
+    sizes = [len(c) for c in columns]
+    total = int(np.prod(sizes))
+    params = np.empty((total, len(names)), dtype=np.float64)
+    for i, idx in enumerate(np.indices(sizes).reshape(len(names), -1)):
+        params[:, i] = columns[i][idx]
+    return params, names
+
+
+_worker_state: Dict[str, object] = {}
+
+
+def _init_worker(features: _Features, params: np.ndarray, names: List[str], task: Optional[str]) -> None:
+    _worker_state.update(features=features, params=params, names=names, task=task)
+
+
+def _evaluate_slice(bounds: Tuple[int, int]) -> Tuple[int, Dict[str, np.ndarray]]:
+    start, stop = bounds
+    params = _worker_state["params"][start:stop]
+    return start, evaluate(_worker_state["features"], params, _worker_state["names"], _worker_state["task"])
+
+
+def grid_search(
+    features: _Features,
+    params: np.ndarray,
+    names: List[str],
+    workers: Optional[int] = None,
+    task: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Avalia todas as linhas de `params`, em blocos cujo tamanho limita a memória
+    dos arrays (P, N, 4), distribuídos entre processos. Com `task`, só avalia essa tarefa.
+    """
+    n_hands = len(features.is_left) if task != "emotion" else 0
+    n_faces = len(features.emotion_labels) if task in (None, "emotion") else 0
+    n_frames = max(1, n_hands, n_faces)
+    chunk = max(1, min(len(params), _CHUNK_ELEMENTS // (n_frames * 5)))
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(chunk, -(-len(params) // workers)))
+    bounds = [(s, min(s + chunk, len(params))) for s in range(0, len(params), chunk)]
+
+    metrics: Dict[str, np.ndarray] = {}
+    if workers <= 1 or len(bounds) == 1:
+        _init_worker(features, params, names, task)
+        results = [_evaluate_slice(b) for b in bounds]
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(features, params, names, task)) as pool:
+            results = list(pool.imap_unordered(_evaluate_slice, bounds))
+
+    for start, part in results:
+        for key, values in part.items():
+            out = metrics.setdefault(key, np.empty(len(params)))
+            out[start:start + len(values)] = values
+    return metrics
+
+
+def best_thresholds(
+    base: Thresholds,
+    params: np.ndarray,
+    names: List[str],
+    metrics: Dict[str, np.ndarray],
+    task: str,
+) -> Tuple[Thresholds, int]:
+    """
+    Melhor linha pelo F1 da tarefa (acurácia desempata); só os campos da tarefa mudam.
+    Gestos dependem dos estados dos dedos, mas os campos de dedo só são gravados pela tarefa "finger".
+    """
+    f1 = np.nan_to_num(metrics[f"{task}_f1"], nan=-1.0)
+    acc = np.nan_to_num(metrics[f"{task}_accuracy"], nan=-1.0)
+    best = int(np.lexsort((-acc, -f1))[0])
+
+    task_fields = {
+        "finger": FINGER_FIELDS,
+        "gesture": GESTURE_FIELDS,
+        "emotion": EMOTION_FIELDS,
+    }[task]
+    updates = {n: float(params[best, i]) for i, n in enumerate(names) if n in task_fields}
+    return replace(base, **updates), best
@@ -2,11 +2,14 @@ from typing import List
 import numpy as np
 
 
-def landmarks_to_pixel_xy(landmarks: List, image_shape: tuple[int, int, int]) -> np.ndarray:
+def landmarks_to_xyz(landmarks: List, out: np.ndarray) -> np.ndarray:
+    """Escreve (x, y, z) normalizados em `out` (21, 3) sem alocar um array novo."""
+    out[:] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+    return out
+
+
+def normalized_to_pixel_xy(xyz: np.ndarray, image_shape: tuple[int, int, int], out: np.ndarray) -> np.ndarray:
+    """Converte (x, y) normalizados em pixels, truncando como `int(x * largura)`, em arrays já alocados."""
     height, width = image_shape[:2]
-    pixel_points = []
-    for lm in landmarks:
-        x_px = int(lm.x * width)
-        y_px = int(lm.y * height)
-        pixel_points.append((x_px, y_px))
-    return np.asarray(pixel_points, dtype=np.int32)
+    np.multiply(xyz[..., :2], np.array((width, height), dtype=np.float64), out=out, casting="unsafe")
+    return out
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from .config import (
+    MAX_NUM_HANDS,
+    WORKER_RING_SLOTS,
+    WORKER_TIMEOUT_S,
+    WORKER_STARTUP_TIMEOUT_S,
+    WORKER_RESTART_DELAY_S,
+)
+from .emotion_detector import EmotionDetector
+from .hand_detector import HandDetector
+from .hand_types import HandBatch
+
+
+BBox = Tuple[int, int, int, int]
+PackedHands = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]
+
+KIND_HANDS = "hands"
+KIND_FACE = "face"
+
+
+def pack_hands(batch: HandBatch) -> PackedHands:
+    """
+    Arrays do HandBatch no layout fixo, baratos de serializar. São cópias porque
+    o batch do detector é reaproveitado e a fila serializa em outra thread.
+    """
+    return (
+        batch.pixel_landmarks.copy(),
+        batch.handedness.copy(),
+        batch.scores.copy(),
+        batch.landmarks.copy(),
+        batch.count,
+    )
+
+
+def unpack_hands(packed: PackedHands, out: HandBatch) -> HandBatch:
+    out.load(*packed)
+    return out
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Anexa sem rastrear (Python 3.13+): quem cria o bloco é quem o remove."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class FrameRing:
+    """
+    Buffer circular de frames em memória compartilhada.
+    Cada slot tem `capacity` bytes e guarda o número de sequência e o shape do
+    frame, então frames de tamanhos diferentes cabem desde que não passem da
+    capacidade. O leitor confere a sequência antes e depois de copiar e descarta
+    o frame se o slot foi sobrescrito no meio.
+    """
+
+    # Cabeçalho por slot: sequência, ndim e até três dimensões
+    _HEADER_FIELDS = 5
+
+    def __init__(self, capacity: int, slots: int = WORKER_RING_SLOTS, name: Optional[str] = None, first_seq: int = 0) -> None:
+        self.capacity = int(capacity)
+        self.slots = slots
+        header_bytes = slots * self._HEADER_FIELDS * np.dtype(np.int64).itemsize
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=header_bytes + slots * self.capacity)
+            self._owner = True
+        else:
+            self._shm = _attach_shared_memory(name)
+            self._owner = False
+
+        self._headers = np.ndarray((slots, self._HEADER_FIELDS), dtype=np.int64, buffer=self._shm.buf)
+        self._frames = np.ndarray((slots, self.capacity), dtype=np.uint8, buffer=self._shm.buf, offset=header_bytes)
+        if self._owner:
+            self._headers[:, 0] = -1
+        self._next_seq = first_seq
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    def write(self, frame: np.ndarray) -> Tuple[int, int]:
+        if frame.dtype != np.uint8 or not 1 <= frame.ndim <= 3:
+            raise ValueError(f"Frame {frame.dtype} {frame.shape} não é uma imagem uint8")
+        if frame.nbytes > self.capacity:
+            raise ValueError(f"Frame {frame.shape} não cabe no buffer de {self.capacity} bytes")
+        seq = self._next_seq
+        slot = seq % self.slots
+        header = self._headers[slot]
+        header[0] = -1
+        header[1] = frame.ndim
+        header[2:2 + frame.ndim] = frame.shape
+        self._frames[slot, :frame.nbytes] = frame.reshape(-1)
+        header[0] = seq
+        self._next_seq += 1
+        return seq, slot
+
+    def read(self, seq: int, slot: int) -> Optional[np.ndarray]:
+        header = self._headers[slot]
+        if header[0] != seq:
+            return None
+        shape = tuple(int(d) for d in header[2:2 + int(header[1])])
+        frame = self._frames[slot, :int(np.prod(shape))].reshape(shape).copy()
+        if header[0] != seq:
+            return None
+        return frame
+
+    def close(self) -> None:
+        # As views precisam sair antes do close, senão o mmap continua exportado
+        self._headers = None
+        self._frames = None
+        try:
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+        except Exception:
+            pass
+
+
+def _worker_main(kind: str, shm_name: str, capacity: int, slots: int, tasks, results, emotion_history: int) -> None:
+    """
+    Loop do processo filho: recebe ("frame", seq, slot), lê o frame do anel e
+    devolve o resultado. ("ring", nome, capacidade) troca para um anel maior.
+    """
+    ring = FrameRing(capacity, slots, name=shm_name)
+    if kind == KIND_HANDS:
+        detector = HandDetector()
+    else:
+        detector = EmotionDetector(history_size=emotion_history)
+
+    results.put(("ready", None, None))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            if task[0] == "ring":
+                ring.close()
+                ring = FrameRing(task[2], slots, name=task[1])
+                continue
+            _, seq, slot = task
+            frame = ring.read(seq, slot)
+            if frame is None:
+                results.put(("result", seq, None))
+            elif kind == KIND_HANDS:
+                results.put(("result", seq, pack_hands(detector.detect_hands(frame))))
+            else:
+                results.put(("result", seq, detector.detect_emotion(frame)))
+    finally:
+        detector.close()
+        ring.close()
+
+
+class _WorkerHandle:
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.process = None
+        self.tasks = None
+        self.results = None
+        self.ready = False
+        self.busy_seq: Optional[int] = None
+        self.busy_since = 0.0
+        self.pending: Optional[Tuple[int, int]] = None
+        self.died_at: Optional[float] = None
+        self.restarts = 0
+
+
+class InlineDetectors:
+    """Detectores no próprio loop, com a mesma interface de ProcessDetectors."""
+
+    def __init__(self, emotion_history: int = 7) -> None:
+        self._hands = HandDetector()
+        self._emotion = EmotionDetector(history_size=emotion_history)
+        self.hand_results = HandBatch(MAX_NUM_HANDS)
+        self.emotion: Optional[str] = None
+        self.face_bbox: Optional[BBox] = None
+        self._updated: Set[str] = set()
+
+    def submit(self, bgr_frame: np.ndarray, run_hands: bool = True, run_face: bool = True) -> None:
+        if run_hands:
+            self.hand_results = self._hands.detect_hands(bgr_frame)
+            self._updated.add(KIND_HANDS)
+        if run_face:
+            self.emotion, self.face_bbox = self._emotion.detect_emotion(bgr_frame)
+            self._updated.add(KIND_FACE)
+
+    def collect(self, wait: bool = False) -> Set[str]:
+        updated, self._updated = self._updated, set()
+        return updated
+
+    def close(self) -> None:
+        self._hands.close()
+        self._emotion.close()
+
+
+class ProcessDetectors:
+    """
+    HandDetector e EmotionDetector, cada um no seu processo.
+    Os frames vão por um FrameRing (sem pickle de pixels) e os resultados voltam
+    em layout fixo. Um frame maior que os slots do anel troca o anel por um
+    maior sem reiniciar os workers. Um worker ocupado não acumula fila: guarda-se só o frame
+    mais recente, enviado assim que ele terminar. Worker que morre ou trava é reiniciado e, enquanto
+    isso, o último resultado continua valendo.
+    """
+
+    def __init__(
+        self,
+        slots: int = WORKER_RING_SLOTS,
+        timeout: float = WORKER_TIMEOUT_S,
+        startup_timeout: float = WORKER_STARTUP_TIMEOUT_S,
+        restart_delay: float = WORKER_RESTART_DELAY_S,
+        emotion_history: int = 7,
+    ) -> None:
+        self.slots = slots
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.restart_delay = restart_delay
+        self.emotion_history = emotion_history
+        self._ctx = multiprocessing.get_context("spawn")
+        self._ring: Optional[FrameRing] = None
+        self._workers: Dict[str, _WorkerHandle] = {}
+        self._last_seq: Dict[str, int] = {KIND_HANDS: -1, KIND_FACE: -1}
+        self._updated: Set[str] = set()
+
+        self.hand_results = HandBatch(MAX_NUM_HANDS)
+        self.emotion: Optional[str] = None
+        self.face_bbox: Optional[BBox] = None
+
+    @property
+    def restarts(self) -> Dict[str, int]:
+        return {kind: w.restarts for kind, w in self._workers.items()}
+
+    def _spawn(self, handle: _WorkerHandle) -> None:
+        handle.tasks = self._ctx.Queue()
+        handle.results = self._ctx.Queue()
+        handle.ready = False
+        handle.busy_seq = None
+        handle.pending = None
+        handle.died_at = None
+        handle.process = self._ctx.Process(
+            target=_worker_main,
+            args=(handle.kind, self._ring.name, self._ring.capacity, self.slots, handle.tasks, handle.results, self.emotion_history),
+            name=f"fingers-{handle.kind}",
+            daemon=True,
+        )
+        handle.process.start()
+
+    def _start(self, capacity: int) -> None:
+        self._ring = FrameRing(capacity, self.slots)
+        for kind in (KIND_HANDS, KIND_FACE):
+            handle = _WorkerHandle(kind)
+            self._workers[kind] = handle
+            self._spawn(handle)
+
+        deadline = time.monotonic() + self.startup_timeout
+        for handle in self._workers.values():
+            while not handle.ready:
+                if not handle.process.is_alive() or time.monotonic() > deadline:
+                    self.close()
+                    raise RuntimeError(f"Não foi possível iniciar o worker de {handle.kind}")
+                self._drain(handle, block_timeout=0.1)
+
+    def submit(self, bgr_frame: np.ndarray, run_hands: bool = True, run_face: bool = True) -> None:
+        if self._ring is None:
+            self._start(bgr_frame.nbytes)
+        elif bgr_frame.nbytes > self._ring.capacity:
+            self._grow_ring(bgr_frame.nbytes)
+
+        seq, slot = self._ring.write(bgr_frame)
+        for kind, run in ((KIND_HANDS, run_hands), (KIND_FACE, run_face)):
+            if run:
+                self._dispatch(self._workers[kind], seq, slot)
+
+    def _grow_ring(self, capacity: int) -> None:
+        """
+        Cria um anel maior e avisa os workers pela fila de tarefas: o que já foi
+        enviado ainda lê o anel antigo, que continua mapeado no worker até a troca.
+        """
+        old = self._ring
+        self._ring = FrameRing(capacity, self.slots, first_seq=old.next_seq)
+        for handle in self._workers.values():
+            handle.pending = None
+            if handle.process is None or not handle.process.is_alive():
+                continue  # o respawn já usa o anel novo
+            if handle.ready:
+                handle.tasks.put(("ring", self._ring.name, self._ring.capacity))
+            else:
+                # Ainda subindo: pode nem ter anexado o anel antigo, que vai sumir
+                self._reap(handle)
+                self._spawn(handle)
+        old.close()
+
+    def _dispatch(self, handle: _WorkerHandle, seq: int, slot: int) -> None:
+        if not handle.ready or handle.busy_seq is not None:
+            handle.pending = (seq, slot)
+            return
+        handle.pending = None
+        handle.tasks.put(("frame", seq, slot))
+        handle.busy_seq = seq
+        handle.busy_since = time.monotonic()
+
+    def _apply(self, kind: str, seq: int, payload) -> None:
+        if payload is None or seq <= self._last_seq[kind]:
+            return
+        self._last_seq[kind] = seq
+        self._updated.add(kind)
+        if kind == KIND_HANDS:
+            unpack_hands(payload, self.hand_results)
+        else:
+            self.emotion, self.face_bbox = payload
+
+    def _drain(self, handle: _WorkerHandle, block_timeout: Optional[float] = None) -> None:
+        while True:
+            try:
+                if block_timeout is not None:
+                    msg, seq, payload = handle.results.get(timeout=block_timeout)
+                    block_timeout = None
+                else:
+                    msg, seq, payload = handle.results.get_nowait()
+            except queue.Empty:
+                return
+            except (EOFError, OSError):
+                return
+
+            if msg == "ready":
+                handle.ready = True
+            elif msg == "result":
+                handle.busy_seq = None
+                self._apply(handle.kind, seq, payload)
+            if handle.pending is not None and handle.busy_seq is None:
+                self._dispatch(handle, *handle.pending)
+
+    def _check_health(self, handle: _WorkerHandle) -> None:
+        now = time.monotonic()
+        alive = handle.process is not None and handle.process.is_alive()
+        hung = handle.busy_seq is not None and now - handle.busy_since > self.timeout
+        if alive and not hung:
+            return
+
+        if handle.died_at is None:
+            reason = "travou" if alive else f"morreu (código {handle.process.exitcode})"
+            print(f"AVISO: worker de {handle.kind} {reason}; reiniciando")
+            handle.died_at = now
+            if alive:
+                handle.process.terminate()
+        if now - handle.died_at >= self.restart_delay:
+            self._reap(handle)
+            handle.restarts += 1
+            self._spawn(handle)
+
+    @staticmethod
+    def _reap(handle: _WorkerHandle, timeout: float = 1.0) -> None:
+        """Encerra o processo e fecha as filas de um worker (pipes e threads de envio)."""
+        process = handle.process
+        if process is not None:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout)
+        for q in (handle.tasks, handle.results):
+            if q is not None:
+                # Com o processo morto, ninguém vai ler o que ficou na fila
+                q.cancel_join_thread()
+                q.close()
+        handle.process = None
+        handle.tasks = None
+        handle.results = None
+
+    def collect(self, wait: bool = False) -> Set[str]:
+        """
+        Aplica os resultados que já chegaram e retorna os tipos (KIND_HANDS/KIND_FACE)
+        com resultado novo desde o último collect. Com `wait=True`, espera os frames
+        enviados neste ciclo (útil para medições determinísticas).
+        """
+        for handle in self._workers.values():
+            if wait:
+                deadline = time.monotonic() + self.timeout
+                while handle.busy_seq is not None and handle.process.is_alive() and time.monotonic() < deadline:
+                    self._drain(handle, block_timeout=0.05)
+            self._drain(handle)
+            self._check_health(handle)
+        updated, self._updated = self._updated, set()
+        return updated
+
+    def close(self) -> None:
+        for handle in self._workers.values():
+            try:
+                if handle.process is not None and handle.process.is_alive():
+                    handle.tasks.put(None)
+                    handle.process.join(timeout=2.0)
+                self._reap(handle)
+            except Exception:
+                pass
+        self._workers = {}
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+
+def create_detectors(mode: str = "inline", emotion_history: int = 7):
+    if mode == "process":
+        return ProcessDetectors(emotion_history=emotion_history)
+    if mode == "inline":
+        return InlineDetectors(emotion_history=emotion_history)
+    raise ValueError(f"Modo de detecção desconhecido: {mode}")
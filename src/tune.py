@@ -0,0 +1,71 @@
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from fingers.config import THRESHOLDS_PATH
+from fingers.thresholds import load_thresholds, save_thresholds
+from fingers.tuning import TASKS, best_thresholds, build_grid, extract_features, grid_search, load_datasets
+
+
+def _parse_values(spec: str) -> List[float]:
+    """'a,b,c' ou 'início:fim:passo' (fim incluso)."""
+    if ":" in spec:
+        start, stop, step = (float(v) for v in spec.split(":"))
+        return list(np.round(np.arange(start, stop + step / 2, step), 10))
+    return [float(v) for v in spec.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Busca em grade dos limiares contra gravações rotuladas.")
+    parser.add_argument("datasets", nargs="+", help="arquivos .npz ou diretórios com .npz")
+    parser.add_argument("--task", choices=TASKS, required=True, help="métrica usada para escolher o melhor conjunto")
+    parser.add_argument("--grid", help="JSON {limiar: [valores]}")
+    parser.add_argument("--param", action="append", default=[], help="limiar=a,b,c ou limiar=início:fim:passo")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default=THRESHOLDS_PATH, help="onde gravar os melhores limiares")
+    parser.add_argument("--dry-run", action="store_true", help="só mostra o resultado, sem gravar")
+    args = parser.parse_args()
+
+    grid: Dict[str, List[float]] = {}
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            grid.update({k: [float(v) for v in vs] for k, vs in json.load(f).items()})
+    for item in args.param:
+        name, _, spec = item.partition("=")
+        grid[name.strip()] = _parse_values(spec)
+
+    base = load_thresholds(args.output)
+    try:
+        data = load_datasets(args.datasets)
+    except (RuntimeError, ValueError) as e:
+        raise SystemExit(str(e))
+    features = extract_features(data)
+    params, names = build_grid(base, grid)
+    print(f"mãos: {len(data.hand_landmarks)} | rostos: {len(data.face_landmarks)} | combinações: {len(params)}")
+
+    start = time.perf_counter()
+    metrics = grid_search(features, params, names, workers=args.workers, task=args.task)
+    print(f"avaliado em {time.perf_counter() - start:.1f}s")
+    if np.isnan(metrics[f"{args.task}_f1"]).all():
+        raise SystemExit(f"Nenhum rótulo para a tarefa '{args.task}' nos datasets")
+
+    f1 = np.nan_to_num(metrics[f"{args.task}_f1"], nan=-1.0)
+    acc = np.nan_to_num(metrics[f"{args.task}_accuracy"], nan=-1.0)
+    order = np.lexsort((-acc, -f1))[: args.top]
+    for rank, row in enumerate(order, 1):
+        values = ", ".join(f"{n}={params[row, names.index(n)]:g}" for n in grid)
+        print(f"{rank:>3}. f1={f1[row]:.4f} acc={acc[row]:.4f}  {values}")
+
+    best, _ = best_thresholds(base, params, names, metrics, args.task)
+    if args.dry_run:
+        return
+    save_thresholds(best, args.output)
+    print(f"melhores limiares gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
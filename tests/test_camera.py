@@ -0,0 +1,47 @@
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from fingers.camera import FrameSource, SyntheticSource, open_frame_source  # noqa: E402
+
+
+def test_frame_source_requires_grab():
+    with pytest.raises(TypeError):
+        FrameSource()
+
+
+@pytest.mark.parametrize("kind", ["video", "images"])
+def test_file_sources_require_path(kind):
+    with pytest.raises(ValueError, match="caminho"):
+        open_frame_source(kind)
+
+
+def test_unknown_source():
+    with pytest.raises(ValueError):
+        open_frame_source("webcam")
+
+
+def test_synthetic_timestamps_follow_fps():
+    source = open_frame_source("synthetic", fps=10.0)
+    assert isinstance(source, SyntheticSource)
+    frames = [source.read() for _ in range(3)]
+    assert [f.frame_id for f in frames] == [0, 1, 2]
+    assert [f.timestamp for f in frames] == [0.0, 0.1, 0.2]
+
+
+class _SlowSource(FrameSource):
+    """Sem fps, como a câmera ao vivo: cada frame demora a chegar."""
+
+    def _grab(self):
+        time.sleep(0.05)
+        return np.zeros((4, 4, 3), dtype=np.uint8)
+
+
+def test_unpaced_timestamps_mark_frame_arrival():
+    source = _SlowSource()
+    first, second = source.read(), source.read()
+    assert first.timestamp >= 0.05
+    assert second.timestamp - first.timestamp >= 0.05
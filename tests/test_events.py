@@ -0,0 +1,35 @@
+from fingers.events import EVENT_COUNT, EVENT_EMOTION, ChangeEmitter, EventBus
+
+
+def _record(observe):
+    bus = EventBus()
+    events = []
+    bus.subscribe(events.append)
+    observe(ChangeEmitter(bus))
+    bus.close()
+    return [(e.kind, e.subject, e.old, e.new) for e in events]
+
+
+def test_counts_follow_hands_present():
+    def observe(emitter):
+        emitter.observe_counts([("Right", 0)], 0)
+        emitter.observe_counts([("Right", 2)], 1)
+        emitter.observe_counts([], 2)  # a mão sai do frame
+        emitter.observe_counts([("Right", 2)], 3)  # volta com a mesma contagem
+        emitter.observe_counts([("Right", 2)], 4)
+
+    assert _record(observe) == [
+        (EVENT_COUNT, "Right", None, 0),
+        (EVENT_COUNT, "Right", 0, 2),
+        (EVENT_COUNT, "Right", 2, None),
+        (EVENT_COUNT, "Right", None, 2),
+    ]
+
+
+def test_startup_emotion_is_not_published():
+    def observe(emitter):
+        emitter.observe_emotion(None)
+        emitter.observe_emotion("normal")
+        emitter.observe_emotion("feliz")
+
+    assert _record(observe) == [(EVENT_EMOTION, None, "normal", "feliz")]
@@ -0,0 +1,56 @@
+import numpy as np
+
+from fingers.finger_counter import FingerCounter, count_fingers, fingers_up_batch
+from fingers.hand_types import HandResult
+
+
+def _hand(fingers_up: int, label: str = "Right") -> HandResult:
+    """Mão sintética com o polegar abaixado e os `fingers_up` primeiros dedos levantados."""
+    lm = np.zeros((21, 2), dtype=np.int32)
+    lm[:, 1] = 200
+    lm[0] = (100, 260)  # punho, dá altura à mão
+    lm[5], lm[17] = (80, 200), (140, 200)  # indicador à esquerda do mínimo
+    lm[4], lm[3] = (80, 220), (70, 220)  # ponta do polegar para dentro da mão: abaixado
+    for i, (tip, pip) in enumerate(zip((8, 12, 16, 20), (6, 10, 14, 18))):
+        x = 80 + 20 * i
+        lm[pip] = (x, 180)
+        lm[tip] = (x, 120) if i < fingers_up else (x, 185)
+    return HandResult(handedness_label=label, pixel_landmarks=lm)
+
+
+def test_synthetic_hand_counts():
+    for n in range(5):
+        assert fingers_up_batch(_hand(n).pixel_landmarks[None]).sum() == n
+
+
+def test_count_fingers_matches_batch():
+    count, states = count_fingers(_hand(2))
+    assert count == 2
+    assert states == {"thumb": False, "index": True, "middle": True, "ring": False, "pinky": False}
+
+
+def test_glitch_followed_by_skipped_frames_keeps_stable_count():
+    counter = FingerCounter(hysteresis_frames=2)
+    for _ in range(3):
+        counter.update([_hand(2)])
+    assert counter.stable_values["Right"] == 2
+
+    # (detecção nova?, mãos): um frame com leitura errada e depois frames pulados
+    # pelo motion gate, que reaproveitam as mesmas mãos
+    glitch = [_hand(3)]
+    frames = [(True, glitch), (False, glitch), (False, glitch), (True, [_hand(2)])]
+    for fresh, hands in frames:
+        if fresh:
+            per_hand_counts, total = counter.update(hands)
+        assert counter.stable_values["Right"] == 2
+    assert per_hand_counts == [("Right", 2)] and total == 2
+
+
+def test_change_confirmed_by_consecutive_detections():
+    counter = FingerCounter(hysteresis_frames=2)
+    counter.update([_hand(1)])
+    counter.update([_hand(1)])
+    counter.update([_hand(4)])
+    assert counter.stable_values["Right"] == 1
+    counter.update([_hand(4)])
+    assert counter.stable_values["Right"] == 4
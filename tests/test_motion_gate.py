@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from fingers.hand_types import HandBatch  # noqa: E402
+from fingers.motion_gate import MotionGate  # noqa: E402
+
+
+HAND_BOX = (100, 100, 60, 60)
+FACE_BOX = (400, 100, 100, 100)
+
+
+def _frame(value: int = 0) -> np.ndarray:
+    return np.full((480, 640, 3), value, dtype=np.uint8)
+
+
+def _hands(box=HAND_BOX) -> HandBatch:
+    x, y, w, h = box
+    batch = HandBatch()
+    landmarks = np.tile([x, y], (21, 1))
+    landmarks[-1] = (x + w, y + h)
+    batch.append("Right", landmarks)
+    return batch
+
+
+def _gate(**kwargs) -> MotionGate:
+    kwargs.setdefault("refresh_frames", 100)
+    return MotionGate(size=(64, 48), pixel_delta=15, hand_threshold=0.01, face_threshold=0.02, **kwargs)
+
+
+def test_static_frame_is_skipped():
+    gate = _gate()
+    assert gate.check(_frame(), _hands(), FACE_BOX) == (True, True)
+    for _ in range(3):
+        assert gate.check(_frame(), _hands(), FACE_BOX) == (False, False)
+    assert gate.skipped_hands == gate.skipped_face == 3
+
+
+def test_refresh_frames_forces_a_run():
+    gate = _gate(refresh_frames=3)
+    runs = [gate.check(_frame(), _hands(), FACE_BOX) for _ in range(7)]
+    assert runs == [(True, True), (False, False), (False, False), (True, True), (False, False), (False, False), (True, True)]
+
+
+@pytest.mark.parametrize("box, expected", [(HAND_BOX, (True, False)), (FACE_BOX, (False, True))])
+def test_small_change_inside_a_box_only_runs_that_detector(box, expected):
+    gate = _gate()
+    gate.check(_frame(), _hands(), FACE_BOX)
+
+    # 40x40 px mudam: pouco para o frame inteiro, muito para a região do bbox
+    frame = _frame()
+    x, y = box[0] + 10, box[1] + 10
+    frame[y:y + 40, x:x + 40] = 255
+    assert gate.check(frame, _hands(), FACE_BOX) == expected
+
+
+def test_slow_changes_accumulate_against_the_reference():
+    gate = _gate()
+    results = [gate.check(_frame(50 + 5 * i), _hands(), FACE_BOX)[0] for i in range(6)]
+    # cada passo (5) fica abaixo de pixel_delta, mas a referência é o último frame em que o detector rodou
+    assert results == [True, False, False, False, True, False]
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+import numpy as np  # noqa: E402
+
+from fingers.recorder import VideoRecorder  # noqa: E402
+
+
+def test_segments_rotate_on_frame_timestamps(tmp_path):
+    # 10 fps de captura com o arquivo a 30 fps: a rotação segue os timestamps, não a contagem de frames
+    recorder = VideoRecorder(tmp_path, prefix="t", fps=30.0, segment_seconds=1.0, metadata=False)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    for frame_id in range(25):
+        assert recorder.submit(frame_id, frame, timestamp=frame_id / 10.0)
+    recorder.close()
+
+    assert recorder.error is None
+    assert recorder.written == 25
+    assert len(recorder.segments) == 3
+
+
+def test_frames_after_a_write_error_are_counted(tmp_path, monkeypatch):
+    from fingers import recorder as recorder_module
+
+    write = recorder_module._Segment.write
+
+    def failing_write(self, frame_id, *args):
+        if frame_id >= 3:
+            raise OSError("disco cheio")
+        write(self, frame_id, *args)
+
+    monkeypatch.setattr(recorder_module._Segment, "write", failing_write)
+    recorder = VideoRecorder(tmp_path, prefix="t", policy="block", metadata=False)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    for frame_id in range(10):
+        recorder.submit(frame_id, frame, timestamp=frame_id / 30.0)
+    recorder.close()
+
+    assert recorder.written == 3
+    assert recorder.failed == 7
+    assert recorder.submitted == recorder.written + recorder.dropped + recorder.failed
@@ -0,0 +1,24 @@
+import json
+from dataclasses import replace
+
+from fingers.thresholds import Thresholds, load_thresholds, save_thresholds
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "thresholds.json"
+    tuned = replace(Thresholds(), finger_gap_ratio=0.2, emotion_min_score=4.5)
+    save_thresholds(tuned, path)
+    assert load_thresholds(path) == tuned
+
+
+def test_missing_file_gives_defaults(tmp_path):
+    assert load_thresholds(tmp_path / "nao_existe.json") == Thresholds()
+
+
+def test_partial_file_keeps_defaults_and_ignores_unknown_keys(tmp_path, capsys):
+    path = tmp_path / "thresholds.json"
+    path.write_text(json.dumps({"l_angle_min": 60, "limiar_antigo": 1.0}), encoding="utf-8")
+
+    loaded = load_thresholds(path)
+    assert loaded == replace(Thresholds(), l_angle_min=60.0)
+    assert "limiar_antigo" in capsys.readouterr().out
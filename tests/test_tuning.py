@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from fingers.emotion_detector import EMOTION_CLASSES, EmotionDetector  # noqa: E402
+from fingers.finger_counter import count_fingers  # noqa: E402
+from fingers.gesture_detector import detect_gestures  # noqa: E402
+from fingers.hand_types import HandResult  # noqa: E402
+from fingers.thresholds import EMOTION_FIELDS, FINGER_FIELDS, Thresholds  # noqa: E402
+from fingers.tuning import (  # noqa: E402
+    GESTURE_CLASSES,
+    LabeledData,
+    best_thresholds,
+    build_grid,
+    evaluate,
+    extract_features,
+    grid_search,
+    predict_emotions,
+    predict_fingers,
+    predict_gestures,
+)
+from tune import _parse_values  # noqa: E402
+
+
+def _dataset(n_hands: int = 2000, n_faces: int = 500) -> LabeledData:
+    rng = np.random.default_rng(0)
+    return LabeledData(
+        hand_landmarks=rng.integers(0, 400, (n_hands, 21, 2)).astype(np.float64),
+        handedness=rng.choice(["Left", "Right"], n_hands),
+        finger_counts=rng.integers(0, 6, n_hands),
+        gestures=rng.choice(list(GESTURE_CLASSES), n_hands),
+        face_landmarks=rng.normal(200, 40, (n_faces, 468, 2)).round(),
+        emotions=rng.choice(list(EMOTION_CLASSES), n_faces),
+    )
+
+
+def test_predictions_with_default_thresholds_match_live_rules():
+    data = _dataset()
+    features = extract_features(data)
+    params, names = build_grid(Thresholds(), {})
+
+    states = predict_fingers(features, params, names)
+    gestures = predict_gestures(features, states, params, names)[0]
+    emotions = predict_emotions(features, params, names)[0]
+
+    hands = [
+        HandResult(label, lm.astype(np.int32))
+        for label, lm in zip(data.handedness, data.hand_landmarks)
+    ]
+    assert states[0].sum(axis=1).tolist() == [count_fingers(h)[0] for h in hands]
+
+    expected = []
+    for hand in hands:
+        left, right = detect_gestures([hand])
+        expected.append(1 if left == "L" else 2 if right == "arminha" else 0)
+    assert gestures.tolist() == expected
+    assert {1, 2} <= set(expected)
+
+    detector = EmotionDetector.__new__(EmotionDetector)
+    live = [detector._analyze_emotion_advanced(face.astype(np.int64)) for face in data.face_landmarks]
+    assert [EMOTION_CLASSES[i] for i in emotions] == live
+    assert len(set(live)) > 1
+
+
+def test_build_grid_order():
+    base = Thresholds()
+    params, names = build_grid(base, {"finger_min_gap_px": [1, 2], "emotion_min_score": [3, 4, 5]})
+
+    assert names == list(base.__dataclass_fields__)
+    assert params[:, names.index("finger_min_gap_px")].tolist() == [1, 1, 1, 2, 2, 2]
+    assert params[:, names.index("emotion_min_score")].tolist() == [3, 4, 5, 3, 4, 5]
+    assert params[:, names.index("l_angle_min")].tolist() == [base.l_angle_min] * 6
+
+    with pytest.raises(ValueError):
+        build_grid(base, {"nao_existe": [1]})
+
+
+def test_best_thresholds_only_changes_task_fields():
+    base = Thresholds()
+    params, names = build_grid(base, {"finger_gap_ratio": [0.05, 0.3], "happy_curve_low": [0.5, 5.0]})
+    metrics = {
+        "finger_f1": np.array([0.1, 0.2, 0.9, 0.9]),
+        "finger_accuracy": np.array([0.1, 0.2, 0.5, 0.8]),
+    }
+
+    best, row = best_thresholds(base, params, names, metrics, "finger")
+
+    assert row == 3
+    assert best.finger_gap_ratio == 0.3
+    assert best.happy_curve_low == base.happy_curve_low
+    changed = {n for n in names if getattr(best, n) != getattr(base, n)}
+    assert changed <= set(FINGER_FIELDS)
+    assert not changed & set(EMOTION_FIELDS)
+
+
+def test_grid_search_is_the_same_across_workers():
+    features = extract_features(_dataset(500, 200))
+    grid = {"finger_gap_ratio": [0.05, 0.1, 0.2], "l_angle_min": [50, 75], "happy_curve_low": [1.0, 2.5]}
+    params, names = build_grid(Thresholds(), grid)
+
+    serial = grid_search(features, params, names, workers=1)
+    parallel = grid_search(features, params, names, workers=2)
+
+    assert serial.keys() == parallel.keys()
+    for key in serial:
+        np.testing.assert_array_equal(serial[key], parallel[key])
+
+
+def test_evaluate_single_task_matches_full_evaluation():
+    features = extract_features(_dataset(300, 100))
+    params, names = build_grid(Thresholds(), {"l_angle_min": [50, 75]})
+    full = evaluate(features, params, names)
+
+    for task in ("finger", "gesture", "emotion"):
+        metrics = evaluate(features, params, names, task)
+        assert set(metrics) == {f"{task}_accuracy", f"{task}_f1"}
+        for key, values in metrics.items():
+            np.testing.assert_array_equal(values, full[key])
+
+
+def test_parse_values():
+    assert _parse_values("1,2.5") == [1.0, 2.5]
+    assert _parse_values("0:1:0.25") == [0.0, 0.25, 0.5, 0.75, 1.0]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from fingers.hand_types import HandBatch  # noqa: E402
+from fingers.workers import KIND_FACE, KIND_HANDS, FrameRing, ProcessDetectors, pack_hands  # noqa: E402
+
+
+def test_collect_reports_only_fresh_results():
+    detectors = ProcessDetectors()
+    assert detectors.collect() == set()
+
+    detectors._apply(KIND_HANDS, 3, pack_hands(HandBatch()))
+    assert detectors.collect() == {KIND_HANDS}
+    assert detectors.collect() == set()
+
+    # resultado atrasado ou de frame ilegível não conta como novo
+    detectors._apply(KIND_HANDS, 2, pack_hands(HandBatch()))
+    detectors._apply(KIND_HANDS, 4, None)
+    detectors._apply(KIND_FACE, 4, ("normal", None))
+    assert detectors.collect() == {KIND_FACE}
+
+
+def test_frame_ring_holds_frames_of_different_sizes():
+    ring = FrameRing(capacity=32 * 32 * 3, slots=2)
+    try:
+        small = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+        gray = np.full((8, 8), 7, dtype=np.uint8)
+        first = ring.write(small)
+        second = ring.write(gray)
+        np.testing.assert_array_equal(ring.read(*first), small)
+        np.testing.assert_array_equal(ring.read(*second), gray)
+
+        # o slot do primeiro frame foi reaproveitado
+        ring.write(small)
+        assert ring.read(*first) is None
+
+        with pytest.raises(ValueError):
+            ring.write(np.zeros((64, 64, 3), dtype=np.uint8))
+    finally:
+        ring.close()
+
+
+def test_restart_closes_the_old_worker_queues():
+    detectors = ProcessDetectors(restart_delay=0.0)
+    try:
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        detectors.submit(frame)
+        detectors.collect(wait=True)
+
+        handle = detectors._workers[KIND_HANDS]
+        old_process, old_tasks, old_results = handle.process, handle.tasks, handle.results
+        old_process.kill()
+        old_process.join()
+        detectors.collect()
+
+        assert handle.process is not old_process and handle.restarts == 1
+        assert old_tasks._closed and old_results._closed
+    finally:
+        detectors.close()